@@ -1,14 +1,26 @@
+import base64
+import hashlib
+import io
 import uuid
 import os
-from typing import Union
+import re
+import warnings
+from collections import Counter
+from functools import lru_cache
+from typing import Generator, Iterable, Iterator, Union
 
+import lxml.etree as ET
 from lxml.etree import Element
 from rdflib import Graph, Literal, URIRef, XSD, RDF, RDFS, OWL
 from slugify import slugify
-from AcdhArcheAssets.uri_norm_rules import get_normalized_uri
-from acdh_tei_pyutils.utils import make_entity_label, check_for_hash, extract_fulltext
+from AcdhArcheAssets.uri_norm_rules import get_normalized_uri  # noqa: F401
+from acdh_tei_pyutils.utils import (  # noqa: F401
+    make_entity_label,
+    check_for_hash,
+    extract_fulltext,
+)
 from acdh_tei_pyutils.tei import TeiReader
-from acdh_cidoc_pyutils.namespaces import (
+from acdh_cidoc_pyutils.namespaces import (  # noqa: F401
     CIDOC,
     FRBROO,
     SARI_FRBROO,
@@ -16,8 +28,39 @@ from acdh_cidoc_pyutils.namespaces import (
     DATE_ATTRIBUTE_DICT,
     SARI,
     GEO,
+    CIDOC_TERMS,
+    FRBROO_TERMS,
+    SARI_FRBROO_TERMS,
+    SARI_TERMS,
+    GEO_TERMS,
+)
+from acdh_cidoc_pyutils.utils import (
+    remove_trailing_slash,
+    drain_into,
+    cached_xpath,
+    compile_xpath,
+    element_text,
+    normalize_uri,
+    compile_authority_patterns,
+)
+from acdh_cidoc_pyutils.utils import (  # noqa: F401
+    xpath_cache_info,
+    normalize_uris,
+    uri_cache_info,
+)
+from acdh_cidoc_pyutils.registries import TimeSpanRegistry, OrgRegistry, TypeRegistry
+from acdh_cidoc_pyutils.instrumentation import (
+    active_collector,
+    diagnostic,
+    instrumented,
 )
-from acdh_cidoc_pyutils.utils import remove_trailing_slash
+
+DATE_CACHE_SIZE = 4096
+DATE_PATTERN = re.compile(
+    r"^(?:(?P<gYear>-?\d{4})|(?P<gYearMonth>-?\d{4}-\d{2})|(?P<date>-?\d{4}-\d{2}-\d{2}))$",
+    re.ASCII,
+)
+DATE_DATATYPES = {"gYear": XSD.gYear, "gYearMonth": XSD.gYearMonth, "date": XSD.date}
 
 authority_patterns = [
     "pmb.acdh.oeaw.ac.at",
@@ -30,6 +73,62 @@ authority_patterns = [
 ]
 
 
+def resolve_relation_type(
+    rel_type: str,
+    default_type_domain="http://pfp-schema.acdh.oeaw.ac.at/types/person-person/#",
+) -> tuple[str, URIRef]:
+    """returns the name used in relation URIs and the type URI of a (looked up) relation type
+
+    Args:
+        rel_type (str): A full type URI like "https://hansi/sumsi/#Is-engaged-to" or a plain type name
+        default_type_domain (str, optional): Prepended to plain type names.
+            Defaults to "http://pfp-schema.acdh.oeaw.ac.at/types/person-person/#".
+
+    Returns:
+        tuple[str, URIRef]: e.g. ("Is-engaged-to", URIRef("https://hansi/sumsi/#Is-engaged-to"))
+    """
+    if rel_type.startswith("http"):
+        if "#" in rel_type:
+            rel_type_name = rel_type.split("#")[-1]
+        else:
+            rel_type_name = remove_trailing_slash(rel_type).split("/")[-1]
+        return rel_type_name, URIRef(rel_type)
+    return rel_type, URIRef(f"{default_type_domain}{rel_type}")
+
+
+def iter_SRPC3_in_social_relation(
+    node: Element,
+    domain="https://foo-bar/",
+    lookup_dict={},
+    default_type_domain="http://pfp-schema.acdh.oeaw.ac.at/types/person-person/#",
+    default_rel_type="In-relation-to",
+    lang="de",
+    verbose=False,
+    entity_prefix="",
+) -> Iterator[tuple]:
+    """yields the triples of `tei_relation_to_SRPC3_in_social_relation` instead of adding them to a Graph"""
+    source = f'{entity_prefix}{check_for_hash(node.attrib["active"])}'
+    target = f'{entity_prefix}{check_for_hash(node.attrib["passive"])}'
+    label = node.attrib["n"]
+    rel_type = default_rel_type
+    orig_rel_type = node.attrib["name"]
+    if lookup_dict:
+        try:
+            rel_type = lookup_dict[orig_rel_type]
+        except KeyError:
+            diagnostic(
+                "relation_type_not_found", verbose=verbose, relation_type=orig_rel_type
+            )
+    rel_type_name, rel_type_uri = resolve_relation_type(rel_type, default_type_domain)
+    relation_uri = URIRef(f"{domain}{source}/{rel_type_name}/{target}")
+    yield (relation_uri, RDF.type, SARI_TERMS["SRPC3_in_social_relation"])
+    yield (relation_uri, RDFS.label, Literal(label, lang=lang))
+    yield (relation_uri, SARI_TERMS["SRP3_relation_type"], rel_type_uri)
+    yield (relation_uri, CIDOC_TERMS["P01_has_domain"], URIRef(f"{domain}{source}"))
+    yield (relation_uri, CIDOC_TERMS["P02_has_range"], URIRef(f"{domain}{target}"))
+
+
+@instrumented
 def tei_relation_to_SRPC3_in_social_relation(
     node: Element,
     domain="https://foo-bar/",
@@ -39,6 +138,7 @@ def tei_relation_to_SRPC3_in_social_relation(
     lang="de",
     verbose=False,
     entity_prefix="",
+    sink=None,
 ) -> Graph:
     """converts a specific TEI relation to SRPC3_in_social_relation
 
@@ -51,86 +151,393 @@ def tei_relation_to_SRPC3_in_social_relation(
         lang (str, optional): The value of the label's lang tag. Defaults to "de".
         entity_prefix (str, optional): Some prefix to add before the IDs of the entities. Defaults to "".
         verbose (bool, optional): Prints if no match in the lookup dict is found. Defaults to False.
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write the triples into. Defaults to None (a new Graph is created).
 
     Returns:
-        Graph: A Graph object containing the SRPC3_in_social_relation
+        Graph: A Graph object containing the SRPC3_in_social_relation (or the passed in sink)
     """  # noqa: E501
-    g = Graph()
-    source = f'{entity_prefix}{check_for_hash(node.attrib["active"])}'
-    target = f'{entity_prefix}{check_for_hash(node.attrib["passive"])}'
-    label = node.attrib["n"]
-    rel_type = default_rel_type
-    orig_rel_type = node.attrib["name"]
-    if lookup_dict:
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_SRPC3_in_social_relation(
+            node=node,
+            domain=domain,
+            lookup_dict=lookup_dict,
+            default_type_domain=default_type_domain,
+            default_rel_type=default_rel_type,
+            lang=lang,
+            verbose=verbose,
+            entity_prefix=entity_prefix,
+        ),
+        g,
+    )
+    return g
+
+
+def _iter_relation_nodes(
+    relations: Union[str, os.PathLike, Element, Iterable[Element]],
+) -> Iterator[Element]:
+    if isinstance(relations, (str, os.PathLike)):
+        relation_tag = f"{{{NSMAP['tei']}}}relation"
+        for _, elem in ET.iterparse(os.fspath(relations), tag=relation_tag):
+            yield elem
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    elif isinstance(relations, ET._Element):
+        yield from cached_xpath(relations, ".//tei:relation")
+    else:
+        yield from relations
+
+
+def iter_SRPC3_relations(
+    relations: Union[str, os.PathLike, Element, Iterable[Element]],
+    domain="https://foo-bar/",
+    lookup_dict={},
+    default_type_domain="http://pfp-schema.acdh.oeaw.ac.at/types/person-person/#",
+    default_rel_type="In-relation-to",
+    lang="de",
+    verbose=False,
+    entity_prefix="",
+) -> Generator[tuple, None, Counter]:
+    """yields the triples of `tei_list_relation_to_SRPC3_in_social_relation` instead of adding them to a Graph
+
+    Returns (via StopIteration.value):
+        Counter: The number of relations per relation name missing from lookup_dict.
+    """  # noqa: E501
+    resolved = {
+        name: resolve_relation_type(rel_type, default_type_domain)
+        for name, rel_type in lookup_dict.items()
+    }
+    default = resolve_relation_type(default_rel_type, default_type_domain)
+    entity_uris = {}
+    unmapped = Counter()
+    rdf_type = RDF.type
+    rdfs_label = RDFS.label
+    srpc3 = SARI_TERMS["SRPC3_in_social_relation"]
+    srp3_relation_type = SARI_TERMS["SRP3_relation_type"]
+    p01 = CIDOC_TERMS["P01_has_domain"]
+    p02 = CIDOC_TERMS["P02_has_range"]
+    for node in _iter_relation_nodes(relations):
+        attrib = node.attrib
+        source = f'{entity_prefix}{check_for_hash(attrib["active"])}'
+        target = f'{entity_prefix}{check_for_hash(attrib["passive"])}'
+        orig_rel_type = attrib["name"]
         try:
-            rel_type = lookup_dict[orig_rel_type]
+            rel_type_name, rel_type_uri = resolved[orig_rel_type]
         except KeyError:
-            if verbose:
-                print(f"Could not find {orig_rel_type} in lookup_dict")
-    if rel_type.startswith("http"):
-        if "#" in rel_type:
-            rel_type_name = rel_type.split("#")[-1]
-        else:
-            rel_type_name = remove_trailing_slash(rel_type).split("/")[-1]
-    else:
-        rel_type_name = rel_type
-    relation_uri = URIRef(f"{domain}{source}/{rel_type_name}/{target}")
-    g.add((relation_uri, RDF.type, SARI["SRPC3_in_social_relation"]))
-    g.add((relation_uri, RDFS.label, Literal(label, lang=lang)))
-    if rel_type.startswith("http"):
-        g.add((relation_uri, SARI["SRP3_relation_type"], URIRef(rel_type)))
-    else:
-        g.add(
-            (
-                relation_uri,
-                SARI["SRP3_relation_type"],
-                URIRef(f"{default_type_domain}{rel_type}"),
-            )
-        )
-    g.add((relation_uri, CIDOC["P01_has_domain"], URIRef(f"{domain}{source}")))
-    g.add((relation_uri, CIDOC["P02_has_range"], URIRef(f"{domain}{target}")))
-    return g
+            rel_type_name, rel_type_uri = default
+            if lookup_dict:
+                unmapped[orig_rel_type] += 1
+        for entity in (source, target):
+            if entity not in entity_uris:
+                entity_uris[entity] = URIRef(f"{domain}{entity}")
+        relation_uri = URIRef(f"{domain}{source}/{rel_type_name}/{target}")
+        yield (relation_uri, rdf_type, srpc3)
+        yield (relation_uri, rdfs_label, Literal(attrib["n"], lang=lang))
+        yield (relation_uri, srp3_relation_type, rel_type_uri)
+        yield (relation_uri, p01, entity_uris[source])
+        yield (relation_uri, p02, entity_uris[target])
+    if unmapped:
+        diagnostic("relation_types_not_found", verbose=verbose, counts=dict(unmapped))
+    return unmapped
+
+
+@instrumented
+def tei_list_relation_to_SRPC3_in_social_relation(
+    relations: Union[str, os.PathLike, Element, Iterable[Element]],
+    domain="https://foo-bar/",
+    lookup_dict={},
+    default_type_domain="http://pfp-schema.acdh.oeaw.ac.at/types/person-person/#",
+    default_rel_type="In-relation-to",
+    lang="de",
+    verbose=False,
+    entity_prefix="",
+    sink=None,
+) -> tuple[Graph, Counter]:
+    """converts all tei:relation elements of a tei:listRelation to SRPC3_in_social_relation
+
+    Produces the same triples as calling `tei_relation_to_SRPC3_in_social_relation` for every relation, but
+    resolves the lookup_dict only once and writes everything into one sink.
+
+    Args:
+        relations (Union[str, os.PathLike, Element, Iterable[Element]]): A path to a TEI file (read with
+            iterparse, relations are cleared once converted), an element containing tei:relation elements
+            (e.g. a tei:listRelation) or an iterable of tei:relation elements.
+        domain (str, optional): The domain to build URIs for the related entities. Defaults to "https://foo-bar/".
+        lookup_dict (dict, optional): Mappings from project specific relation types to pfp-types. Defaults to {}.
+        default_type_domain (str, optional): The type-domain. Defaults to "http://pfp-schema.acdh.oeaw.ac.at/types/person-person/#".
+        default_rel_type (str, optional): Type used for relations missing from the lookup_dict. Defaults to "In-relation-to".
+        lang (str, optional): The value of the label's lang tag. Defaults to "de".
+        verbose (bool, optional): Logs one summary of the relation names missing from lookup_dict. Defaults to False.
+        entity_prefix (str, optional): Some prefix to add before the IDs of the entities. Defaults to "".
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write the triples into. Defaults to None (a new Graph is created).
+
+    Returns:
+        tuple[Graph, Counter]: The Graph (or the passed in sink) and the number of relations per relation name missing from lookup_dict
+    """  # noqa: E501
+    g = Graph() if sink is None else sink
+    unmapped = drain_into(
+        iter_SRPC3_relations(
+            relations=relations,
+            domain=domain,
+            lookup_dict=lookup_dict,
+            default_type_domain=default_type_domain,
+            default_rel_type=default_rel_type,
+            lang=lang,
+            verbose=verbose,
+            entity_prefix=entity_prefix,
+        ),
+        g,
+    )
+    return g, unmapped
 
 
 def normalize_string(string: str) -> str:
-    return " ".join(" ".join(string.split()).split())
+    return " ".join(string.split())
 
 
-def coordinates_to_p168(
+def iter_p168(
     subj: URIRef,
     node: Element,
     coords_xpath=".//tei:geo[1]",
     separator=" ",
     inverse=False,
     verbose=False,
-) -> Graph:
-    g = Graph()
+) -> Iterator[tuple]:
+    """yields the triples of `coordinates_to_p168` instead of adding them to a Graph"""
     try:
-        coords = node.xpath(coords_xpath, namespaces=NSMAP)[0]
-    except IndexError as e:
-        if verbose:
-            print(e, subj)
-        return g
+        coords = cached_xpath(node, coords_xpath)[0]
+    except IndexError:
+        diagnostic("coordinates_not_found", verbose=verbose, subj=f"{subj}")
+        return
     try:
         lat, lng = coords.text.split(separator)
     except (ValueError, AttributeError) as e:
-        if verbose:
-            print(e, subj)
-        return g
+        diagnostic(
+            "coordinates_not_parsable", verbose=verbose, subj=f"{subj}", error=f"{e}"
+        )
+        return
     lat = lat.replace(",", "")
     lng = lng.replace(",", "")
     if inverse:
         lat, lng = lng, lat
-    g.set(
-        (
-            subj,
-            CIDOC["P168_place_is_defined_by"],
-            Literal(f"Point({lng} {lat})", datatype=GEO["wktLiteral"]),
-        )
+    yield (
+        subj,
+        CIDOC_TERMS["P168_place_is_defined_by"],
+        Literal(f"Point({lng} {lat})", datatype=GEO_TERMS["wktLiteral"]),
+    )
+
+
+@instrumented
+def coordinates_to_p168(
+    subj: URIRef,
+    node: Element,
+    coords_xpath=".//tei:geo[1]",
+    separator=" ",
+    inverse=False,
+    verbose=False,
+    sink=None,
+) -> Graph:
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_p168(
+            subj=subj,
+            node=node,
+            coords_xpath=coords_xpath,
+            separator=separator,
+            inverse=inverse,
+            verbose=verbose,
+        ),
+        g,
     )
     return g
 
 
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - depends on the environment
+        raise ImportError(
+            "batch coordinate parsing requires the 'numpy' package: pip install numpy"
+        )
+    return numpy
+
+
+def _parse_floats(np, values: list):
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        parsed = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                parsed[i] = np.nan
+        return parsed
+
+
+def iter_p168_places(
+    places: Iterable[tuple[URIRef, Element]],
+    coords_xpath=".//tei:geo[1]",
+    separator=" ",
+    inverse=False,
+    precision=6,
+    swap_radius: Union[float, None] = None,
+    fix_swapped=False,
+    verbose=False,
+) -> Generator[tuple, None, dict]:
+    """yields the triples of `list_place_coordinates_to_p168` instead of adding them to a Graph
+
+    All coordinates are parsed and validated before the first triple is yielded.
+
+    Returns (via StopIteration.value):
+        dict: The validation report, see `list_place_coordinates_to_p168`.
+    """  # noqa: E501
+    np = _import_numpy()
+    report = {
+        "places": 0,
+        "converted": 0,
+        "not_found": [],
+        "not_parsable": [],
+        "out_of_range": [],
+        "swapped": [],
+    }
+    subjects, lats, lngs = [], [], []
+    # the first tei:geo descendant in document order is also the first match of ".//tei:geo[1]"
+    geo_tag = f"{{{NSMAP['tei']}}}geo" if coords_xpath == ".//tei:geo[1]" else None
+    for subj, node in places:
+        report["places"] += 1
+        try:
+            if geo_tag is None:
+                coords = cached_xpath(node, coords_xpath)[0]
+            else:
+                coords = next(node.iter(geo_tag))
+        except (IndexError, StopIteration):
+            report["not_found"].append(f"{subj}")
+            diagnostic("coordinates_not_found", verbose=verbose, subj=f"{subj}")
+            continue
+        try:
+            lat, lng = coords.text.split(separator)
+        except (ValueError, AttributeError) as e:
+            report["not_parsable"].append(f"{subj}")
+            diagnostic(
+                "coordinates_not_parsable",
+                verbose=verbose,
+                subj=f"{subj}",
+                error=f"{e}",
+            )
+            continue
+        subjects.append(subj)
+        lats.append(lat.replace(",", ""))
+        lngs.append(lng.replace(",", ""))
+    if not subjects:
+        return report
+    lat, lng = _parse_floats(np, lats), _parse_floats(np, lngs)
+    if inverse:
+        lat, lng = lng, lat
+    parsable = np.isfinite(lat) & np.isfinite(lng)
+    in_range = parsable & (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+    # out of range as given, but valid with latitude and longitude swapped
+    swapped = parsable & ~in_range & (np.abs(lng) <= 90) & (np.abs(lat) <= 180)
+    if swap_radius is not None and in_range.any():
+        center_lat, center_lng = np.median(lat[in_range]), np.median(lng[in_range])
+        distance = np.hypot(lat - center_lat, lng - center_lng)
+        swapped_distance = np.hypot(lng - center_lat, lat - center_lng)
+        closer_swapped = (distance > swap_radius) & (swapped_distance <= swap_radius)
+        swapped |= in_range & (np.abs(lng) <= 90) & closer_swapped
+    if fix_swapped:
+        lat, lng = np.where(swapped, lng, lat), np.where(swapped, lat, lng)
+        valid = in_range | swapped
+    else:
+        valid = in_range
+    for i in np.flatnonzero(~parsable):
+        report["not_parsable"].append(f"{subjects[i]}")
+        diagnostic(
+            "coordinates_not_parsable",
+            verbose=verbose,
+            subj=f"{subjects[i]}",
+            error=f"could not convert {lats[i]!r} {lngs[i]!r} to float",
+        )
+    for i in np.flatnonzero(parsable & ~in_range & ~swapped):
+        report["out_of_range"].append(f"{subjects[i]}")
+        diagnostic("coordinates_out_of_range", verbose=verbose, subj=f"{subjects[i]}")
+    for i in np.flatnonzero(swapped):
+        report["swapped"].append(f"{subjects[i]}")
+        diagnostic("coordinates_swapped", verbose=verbose, subj=f"{subjects[i]}")
+    indices = np.flatnonzero(valid).tolist()
+    # adding 0.0 turns the -0.0 of e.g. rounded -1e-9 into 0.0
+    lat = (np.round(lat, precision) + 0.0).tolist()
+    lng = (np.round(lng, precision) + 0.0).tolist()
+    p168 = CIDOC_TERMS["P168_place_is_defined_by"]
+    wkt_literal = GEO_TERMS["wktLiteral"]
+    for i in indices:
+        yield (
+            subjects[i],
+            p168,
+            Literal(
+                f"Point({lng[i]:.{precision}f} {lat[i]:.{precision}f})",
+                datatype=wkt_literal,
+            ),
+        )
+    report["converted"] = len(indices)
+    return report
+
+
+@instrumented
+def list_place_coordinates_to_p168(
+    places: Iterable[tuple[URIRef, Element]],
+    coords_xpath=".//tei:geo[1]",
+    separator=" ",
+    inverse=False,
+    precision=6,
+    swap_radius: Union[float, None] = None,
+    fix_swapped=False,
+    verbose=False,
+    sink=None,
+) -> tuple[Graph, dict]:
+    """converts and validates the coordinates of many places (e.g. of a tei:listPlace) in one pass
+
+    Parses all coordinates with NumPy (`pip install acdh_cidoc_pyutils[numpy]`), checks their ranges and
+    emits WKT literals with a fixed number of decimals. Places whose coordinates are missing, not parsable
+    or out of range get no P168 triple.
+
+    Args:
+        places (Iterable[tuple[URIRef, Element]]): The (subject, tei:place) pairs to convert.
+        coords_xpath (str, optional): An XPath expression pointing to the coordinates. Defaults to ".//tei:geo[1]".
+        separator (str, optional): Separator of the coordinates. Defaults to " ".
+        inverse (bool, optional): Set to True if the coordinates are stored as "lng lat". Defaults to False.
+        precision (int, optional): Number of decimals of the WKT literals. Defaults to 6.
+        swap_radius (Union[float, None], optional): If set, coordinates farther than `swap_radius` degrees
+            from the median of all places which would lie within that radius with latitude and longitude
+            swapped are reported as swapped, too. Defaults to None (only out of range coordinates which are
+            valid when swapped are reported).
+        fix_swapped (bool, optional): Emits swapped coordinates in corrected order. Defaults to False (swapped
+            coordinates are emitted as given if they are in range and skipped otherwise).
+        verbose (bool, optional): Logs every problem as a warning. Defaults to False.
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write the triples into. Defaults to None (a new Graph is created).
+
+    Returns:
+        tuple[Graph, dict]: The Graph (or the passed in sink) and a report with the number of "places" and
+            "converted" places and the subjects (as str) of the places whose coordinates were "not_found",
+            "not_parsable", "out_of_range" or "swapped"
+    """  # noqa: E501
+    g = Graph() if sink is None else sink
+    report = drain_into(
+        iter_p168_places(
+            places=places,
+            coords_xpath=coords_xpath,
+            separator=separator,
+            inverse=inverse,
+            precision=precision,
+            swap_radius=swap_radius,
+            fix_swapped=fix_swapped,
+            verbose=verbose,
+        ),
+        g,
+    )
+    return g, report
+
+
 def extract_begin_end(
     date_object: Union[Element, dict],
     fill_missing=True,
@@ -172,8 +579,9 @@ def extract_begin_end(
     return final_start, final_end
 
 
-def date_to_literal(
-    date_str: Union[str, bool], not_known_value="undefined", default_lang="en"
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _date_to_literal(
+    date_str: Union[str, bool], not_known_value: str, default_lang: str
 ) -> Literal:
     if date_str is None:
         return_value = Literal(not_known_value, lang=default_lang)
@@ -193,6 +601,55 @@ def date_to_literal(
     return return_value
 
 
+def date_to_literal(
+    date_str: Union[str, bool], not_known_value="undefined", default_lang="en"
+) -> Literal:
+    return _date_to_literal(date_str, not_known_value, default_lang)
+
+
+def date_cache_info():
+    """hit/miss statistics of the memoized `date_to_literal` (a functools `CacheInfo` named tuple)"""
+    return _date_to_literal.cache_info()
+
+
+def dates_to_literals(
+    date_strs: Iterable[Union[str, None]],
+    not_known_value="undefined",
+    default_lang="en",
+) -> list[Literal]:
+    """types a whole sequence of date strings at once, e.g. all values collected with `extract_begin_end`
+
+    Unlike `date_to_literal` the shape of every value is validated with DATE_PATTERN, so odd values
+    like "19xx" or "1900-1" are typed as xsd:string instead of xsd:gYear/xsd:gYearMonth.
+    Repeated values share the same Literal object.
+
+    Args:
+        date_strs (Iterable[Union[str, None]]): The date strings; None and "" become `not_known_value`
+        not_known_value (str, optional): Value used for missing dates. Defaults to "undefined".
+        default_lang (str, optional): Lang tag of the `not_known_value` literal. Defaults to "en".
+
+    Returns:
+        list[Literal]: One typed Literal per input value
+    """  # noqa: E501
+    not_known = Literal(not_known_value, lang=default_lang)
+    seen = {None: not_known, "": not_known}
+    result = []
+    for date_str in date_strs:
+        try:
+            result.append(seen[date_str])
+            continue
+        except KeyError:
+            pass
+        match = DATE_PATTERN.match(date_str)
+        if match:
+            literal = Literal(date_str, datatype=DATE_DATATYPES[match.lastgroup])
+        else:
+            literal = Literal(date_str, datatype=XSD.string)
+        seen[date_str] = literal
+        result.append(literal)
+    return result
+
+
 def make_uri(domain="https://foo.bar/whatever", version="", prefix="") -> URIRef:
     if domain.endswith("/"):
         domain = domain[:-1]
@@ -202,7 +659,90 @@ def make_uri(domain="https://foo.bar/whatever", version="", prefix="") -> URIRef
     return URIRef(uri)
 
 
-def create_e52(
+def _mint_base(domain: str, version: str, prefix: str) -> str:
+    if domain.endswith("/"):
+        domain = domain[:-1]
+    return "/".join([x for x in [domain, version, prefix] if x != ""])
+
+
+def _iter_minted_ids(keys: Iterable[str], base: str, method: str, length: int):
+    namespace = uuid.uuid5(uuid.NAMESPACE_URL, base)
+    if method == "uuid5":
+        for key in keys:
+            yield key, f"{uuid.uuid5(namespace, key)}"
+    elif method == "base32":
+        seeded = hashlib.sha1(namespace.bytes)
+        for key in keys:
+            digest = seeded.copy()
+            digest.update(key.encode("utf-8"))
+            yield key, base64.b32encode(digest.digest()).decode("ascii")[
+                :length
+            ].lower()
+    else:
+        raise ValueError(f"unsupported method: {method}, use 'uuid5' or 'base32'")
+
+
+def mint_uri(
+    key: str,
+    domain="https://foo.bar/whatever",
+    version="",
+    prefix="",
+    method="uuid5",
+    length=16,
+) -> URIRef:
+    """like `make_uri` but derives the ID from a content key, so the same key always gets the same URI
+
+    Args:
+        key (str): Some stable content key, e.g. an @xml:id or "{person}/{relation}/{target}"
+        domain (str, optional): Defaults to "https://foo.bar/whatever".
+        version (str, optional): Defaults to "".
+        prefix (str, optional): Defaults to "".
+        method (str, optional): "uuid5" (UUIDv5 in a namespace derived from domain/version/prefix) or
+            "base32" (the first `length` characters of the base32 encoded sha1 digest). Defaults to "uuid5".
+        length (int, optional): Length of "base32" IDs (16 characters = 80 bits). Defaults to 16.
+
+    Returns:
+        URIRef: e.g. https://foo.bar/1/sumsi/b7e20d2d-e0fc-507f-9ae0-02dbbb9cbcc0 or https://foo.bar/1/sumsi/w7ra2lpa7sah6gxa
+    """  # noqa: E501
+    base = _mint_base(domain, version, prefix)
+    some_id = next(_iter_minted_ids([key], base, method, length))[1]
+    return URIRef(f"{base}/{some_id}")
+
+
+def mint_uris(
+    keys: Iterable[str],
+    domain="https://foo.bar/whatever",
+    version="",
+    prefix="",
+    method="uuid5",
+    length=16,
+    check_collisions=True,
+) -> list[URIRef]:
+    """mints the URIs of many keys at once, see `mint_uri`
+
+    Args:
+        keys (Iterable[str]): The content keys
+        check_collisions (bool, optional): Raise a ValueError if two different keys get the same URI
+            (only realistic for short "base32" IDs). Defaults to True.
+
+    Returns:
+        list[URIRef]: One URI per key, in input order
+    """  # noqa: E501
+    base = _mint_base(domain, version, prefix)
+    uris = []
+    seen = {}
+    for key, some_id in _iter_minted_ids(keys, base, method, length):
+        if check_collisions:
+            other_key = seen.setdefault(some_id, key)
+            if other_key != key:
+                raise ValueError(
+                    f"'{key}' and '{other_key}' are both minted to {base}/{some_id}"
+                )
+        uris.append(URIRef(f"{base}/{some_id}"))
+    return uris
+
+
+def iter_e52(
     uri: URIRef,
     type_uri: Union[URIRef, None] = None,
     begin_of_begin="",
@@ -210,86 +750,104 @@ def create_e52(
     label=True,
     not_known_value="undefined",
     default_lang="en",
-) -> Graph:
-    g = Graph()
-    g.add((uri, RDF.type, CIDOC["E52_Time-Span"]))
+) -> Iterator[tuple]:
+    """yields the triples of `create_e52` instead of adding them to a Graph"""
+    begin_literal = date_to_literal(
+        begin_of_begin, not_known_value=not_known_value, default_lang=default_lang
+    )
+    end_literal = date_to_literal(
+        end_of_end, not_known_value=not_known_value, default_lang=default_lang
+    )
+    yield (uri, RDF.type, CIDOC_TERMS["E52_Time-Span"])
     if begin_of_begin != "":
-        g.add(
-            (
-                uri,
-                CIDOC["P82a_begin_of_the_begin"],
-                date_to_literal(
-                    begin_of_begin,
-                    not_known_value=not_known_value,
-                    default_lang=default_lang,
-                ),
-            )
-        )
+        yield (uri, CIDOC_TERMS["P82a_begin_of_the_begin"], begin_literal)
     if end_of_end != "":
-        g.add(
-            (
-                uri,
-                CIDOC["P82b_end_of_the_end"],
-                date_to_literal(
-                    end_of_end,
-                    not_known_value=not_known_value,
-                    default_lang=default_lang,
-                ),
-            )
-        )
+        yield (uri, CIDOC_TERMS["P82b_end_of_the_end"], end_literal)
     if end_of_end == "" and begin_of_begin != "":
-        g.add(
-            (
-                uri,
-                CIDOC["P82b_end_of_the_end"],
-                date_to_literal(
-                    begin_of_begin,
-                    not_known_value=not_known_value,
-                    default_lang=default_lang,
-                ),
-            )
-        )
+        yield (uri, CIDOC_TERMS["P82b_end_of_the_end"], begin_literal)
     if begin_of_begin == "" and end_of_end != "":
-        g.add(
-            (
-                uri,
-                CIDOC["P82a_begin_of_the_begin"],
-                date_to_literal(
-                    end_of_end,
-                    not_known_value=not_known_value,
-                    default_lang=default_lang,
-                ),
-            )
-        )
-    else:
-        pass
+        yield (uri, CIDOC_TERMS["P82a_begin_of_the_begin"], end_literal)
     if label:
-        label_str = " - ".join(
-            [
-                date_to_literal(
-                    begin_of_begin,
-                    not_known_value=not_known_value,
-                    default_lang=default_lang,
-                ),
-                date_to_literal(
-                    end_of_end,
-                    not_known_value=not_known_value,
-                    default_lang=default_lang,
-                ),
-            ]
-        ).strip()
+        label_str = " - ".join([begin_literal, end_literal]).strip()
         if label_str != "":
             start, end = label_str.split(" - ")
             if start == end:
-                g.add((uri, RDFS.label, Literal(start, datatype=XSD.string)))
+                yield (uri, RDFS.label, Literal(start, datatype=XSD.string))
             else:
-                g.add((uri, RDFS.label, Literal(label_str, datatype=XSD.string)))
+                yield (uri, RDFS.label, Literal(label_str, datatype=XSD.string))
     if type_uri:
-        g.add((uri, CIDOC["P2_has_type"], type_uri))
+        yield (uri, CIDOC_TERMS["P2_has_type"], type_uri)
+
+
+@instrumented
+def create_e52(
+    uri: URIRef,
+    type_uri: Union[URIRef, None] = None,
+    begin_of_begin="",
+    end_of_end="",
+    label=True,
+    not_known_value="undefined",
+    default_lang="en",
+    sink=None,
+) -> Graph:
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_e52(
+            uri=uri,
+            type_uri=type_uri,
+            begin_of_begin=begin_of_begin,
+            end_of_end=end_of_end,
+            label=label,
+            not_known_value=not_known_value,
+            default_lang=default_lang,
+        ),
+        g,
+    )
     return g
 
 
-def make_appellations(
+def _iter_time_span(
+    event_uri: URIRef,
+    ts_uri: URIRef,
+    begin: Union[str, None],
+    end: Union[str, None],
+    time_spans: Union[TimeSpanRegistry, None] = None,
+    type_uri: Union[URIRef, None] = None,
+    not_known_value="undefined",
+) -> Generator[tuple, None, URIRef]:
+    """links an event via P4_has_time-span to `ts_uri` or, if a registry is passed, to the shared time-span
+
+    Returns (via StopIteration.value):
+        URIRef: The URI of the linked time-span.
+    """  # noqa: E501
+    is_new = True
+    if time_spans is not None:
+        ts_uri, is_new = time_spans.resolve(begin, end, type_uri)
+    yield (event_uri, CIDOC_TERMS["P4_has_time-span"], ts_uri)
+    if is_new:
+        yield from iter_e52(
+            ts_uri,
+            type_uri,
+            begin_of_begin=begin,
+            end_of_end=end,
+            not_known_value=not_known_value,
+        )
+    return ts_uri
+
+
+def _iter_type(
+    type_uri: URIRef,
+    label: str,
+    lang="en",
+    type_registry: Union[TypeRegistry, None] = None,
+) -> Iterator[tuple]:
+    """yields the E55_Type triples of a type unless `type_registry` has already seen it"""
+    if type_registry is None or type_registry.register(type_uri):
+        yield (type_uri, RDF.type, CIDOC_TERMS["E55_Type"])
+        yield (type_uri, RDFS.label, Literal(label, lang=lang))
+
+
+def iter_appellations(
     subj: URIRef,
     node: Element,
     type_domain="https://foo-bar/",
@@ -297,10 +855,11 @@ def make_appellations(
     woke_type=False,
     default_lang="de",
     special_xpath=None,
-) -> Graph:
+    type_registry: Union[TypeRegistry, None] = None,
+) -> Iterator[tuple]:
+    """yields the triples of `make_appellations` instead of adding them to a Graph"""
     if not type_domain.endswith("/"):
         type_domain = f"{type_domain}/"
-    g = Graph()
     tag_name = node.tag.split("}")[-1]
     base_type_uri = f"{type_domain}{tag_name}"
     if tag_name.endswith("place"):
@@ -312,94 +871,112 @@ def make_appellations(
     elif tag_name.endswith("bibl"):
         xpath_expression = ".//tei:title[1]"
     else:
-        return g
+        return
     if special_xpath:
         xpath_expression = f"{xpath_expression}{special_xpath}"
-    for i, y in enumerate(node.xpath(xpath_expression, namespaces=NSMAP)):
+    names = cached_xpath(node, xpath_expression)
+    if not names:
+        return
+    first_name_el = names[0]
+    first_label, first_lang = make_entity_label(
+        first_name_el, default_lang=default_lang
+    )
+    # E55_Type URIs and labels, one entry per (element name, type label)
+    types = {}
+    for i, y in enumerate(names):
+        lang_tag = y.get("{http://www.w3.org/XML/1998/namespace}lang", default_lang)
+        child_count = len(cached_xpath(y, "./*"))
+        # "text": plain text name, "mixed": several child elements, "single": anything else
+        if child_count < 1 and y.text:
+            kind = "text"
+        elif child_count > 1:
+            kind = "mixed"
+        else:
+            kind = "single"
+        type_label = y.get(type_attribute) if kind == "text" else None
+        type_key = (y.tag, type_label, kind)
         try:
-            lang_tag = y.attrib["{http://www.w3.org/XML/1998/namespace}lang"]
+            cur_type_uri, type_label_literal = types[type_key]
         except KeyError:
-            lang_tag = default_lang
-        type_uri = f"{base_type_uri}/{y.tag.split('}')[-1]}"
-        if len(y.xpath("./*")) < 1 and y.text:
-            app_uri = URIRef(f"{subj}/appellation/{i}")
-            g.add((subj, CIDOC["P1_is_identified_by"], app_uri))
-            g.add((app_uri, RDF.type, CIDOC["E33_E41_Linguistic_Appellation"]))
-            g.add(
-                (app_uri, RDFS.label, Literal(normalize_string(y.text), lang=lang_tag))
-            )
-            g.add((app_uri, RDF.value, Literal(normalize_string(y.text))))
-            type_label = y.get(type_attribute)
-            if type_label:
+            type_uri = f"{base_type_uri}/{y.tag.split('}')[-1]}"
+            if type_label and type_registry is not None:
+                cur_type_uri = type_registry.make_uri(type_uri, type_label)
+                label = f"Appellation of type: {type_label}"
+            elif type_label:
                 cur_type_uri = URIRef(f"{type_uri}/{slugify(type_label)}".lower())
-            elif woke_type:
-                cur_type_uri = URIRef(f"{type_uri.lower()}/{woke_type}")
-            else:
-                cur_type_uri = URIRef(type_uri.lower())
-            g.add((cur_type_uri, RDF.type, CIDOC["E55_Type"]))
-            if type_label:
-                g.add(
-                    (
-                        cur_type_uri,
-                        RDFS.label,
-                        Literal(f"Appellation of type: {type_label}", lang="en"),
-                    )
-                )
+                label = f"Appellation of type: {type_label}"
             else:
+                if woke_type and kind != "single":
+                    cur_type_uri = URIRef(f"{type_uri.lower()}/{woke_type}")
+                else:
+                    cur_type_uri = URIRef(type_uri.lower())
                 label = f"Appellation of type: {cur_type_uri.split('/')[-1]}'"
-                g.add((cur_type_uri, RDFS.label, Literal(label, lang="en")))
-            g.add((app_uri, CIDOC["P2_has_type"], cur_type_uri))
-        elif len(y.xpath("./*")) > 1:
+            type_label_literal = Literal(label, lang="en")
+            types[type_key] = cur_type_uri, type_label_literal
+        if kind == "text":
             app_uri = URIRef(f"{subj}/appellation/{i}")
-            g.add((subj, CIDOC["P1_is_identified_by"], app_uri))
-            g.add((app_uri, RDF.type, CIDOC["E33_E41_Linguistic_Appellation"]))
-            entity_label_str, cur_lang = make_entity_label(y, default_lang=default_lang)
-            g.add(
-                (
-                    app_uri,
-                    RDFS.label,
-                    Literal(normalize_string(entity_label_str), lang=cur_lang),
-                )
-            )
-            if woke_type:
-                cur_type_uri = URIRef(f"{type_uri.lower()}/{woke_type}")
+            text = normalize_string(y.text)
+            label_literal = Literal(text, lang=lang_tag)
+        elif kind == "mixed":
+            app_uri = URIRef(f"{subj}/appellation/{i}")
+            if i == 0:
+                entity_label_str, cur_lang = first_label, first_lang
             else:
-                cur_type_uri = URIRef(f"{type_uri.lower()}")
-            g.add((cur_type_uri, RDF.type, CIDOC["E55_Type"]))
-            label = f"Appellation of type: {cur_type_uri.split('/')[-1]}'"
-            g.add((cur_type_uri, RDFS.label, Literal(label, lang="en")))
-            g.add((app_uri, CIDOC["P2_has_type"], cur_type_uri))
+                entity_label_str, cur_lang = make_entity_label(
+                    y, default_lang=default_lang
+                )
+            label_literal = Literal(normalize_string(entity_label_str), lang=cur_lang)
         else:
+            # labelled after the first name element
             app_uri = URIRef(f"{subj}/appellation")
-            g.add((subj, CIDOC["P1_is_identified_by"], app_uri))
-            g.add((app_uri, RDF.type, CIDOC["E33_E41_Linguistic_Appellation"]))
-            entity_label_str, cur_lang = make_entity_label(
-                node.xpath(xpath_expression, namespaces=NSMAP)[0]
-            )
-            g.add(
-                (
-                    app_uri,
-                    RDFS.label,
-                    Literal(normalize_string(entity_label_str), lang=cur_lang),
-                )
+            label_literal = Literal(
+                normalize_string(first_label),
+                lang=first_name_el.get(
+                    "{http://www.w3.org/XML/1998/namespace}lang", "en"
+                ),
             )
-            cur_type_uri = URIRef(f"{type_uri.lower()}")
-            g.add((cur_type_uri, RDF.type, CIDOC["E55_Type"]))
-            label = f"Appellation of type: {cur_type_uri.split('/')[-1]}'"
-            g.add((cur_type_uri, RDFS.label, Literal(label, lang="en")))
-            g.add((app_uri, CIDOC["P2_has_type"], cur_type_uri))
-    try:
-        first_name_el = node.xpath(xpath_expression, namespaces=NSMAP)[0]
-    except IndexError:
-        return g
-    entity_label_str, cur_lang = make_entity_label(
-        first_name_el, default_lang=default_lang
+        yield (subj, CIDOC_TERMS["P1_is_identified_by"], app_uri)
+        yield (app_uri, RDF.type, CIDOC_TERMS["E33_E41_Linguistic_Appellation"])
+        yield (app_uri, RDFS.label, label_literal)
+        if kind == "text":
+            yield (app_uri, RDF.value, Literal(text))
+        if type_registry is None or type_registry.register(cur_type_uri):
+            yield (cur_type_uri, RDF.type, CIDOC_TERMS["E55_Type"])
+            yield (cur_type_uri, RDFS.label, type_label_literal)
+        yield (app_uri, CIDOC_TERMS["P2_has_type"], cur_type_uri)
+    yield (subj, RDFS.label, Literal(first_label, lang=first_lang))
+
+
+@instrumented
+def make_appellations(
+    subj: URIRef,
+    node: Element,
+    type_domain="https://foo-bar/",
+    type_attribute="type",
+    woke_type=False,
+    default_lang="de",
+    special_xpath=None,
+    type_registry: Union[TypeRegistry, None] = None,
+    sink=None,
+) -> Graph:
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_appellations(
+            subj=subj,
+            node=node,
+            type_domain=type_domain,
+            type_attribute=type_attribute,
+            woke_type=woke_type,
+            default_lang=default_lang,
+            special_xpath=special_xpath,
+            type_registry=type_registry,
+        ),
+        g,
     )
-    g.add((subj, RDFS.label, Literal(entity_label_str, lang=cur_lang)))
     return g
 
 
-def make_e42_identifiers(
+def iter_e42_identifiers(
     subj: URIRef,
     node: Element,
     type_domain="https://foo-bar/",
@@ -408,22 +985,10 @@ def make_e42_identifiers(
     same_as=True,
     authority_patterns=authority_patterns,
     default_prefix="Identifier: ",
-) -> Graph:
-    """
-    Creates RDF triples for E42 Identifiers based on the provided XML node.
-    Args:
-        subj (URIRef): The subject URIRef to which the identifiers are related.
-        node (Element): The XML element containing identifier information.
-        type_domain (str, optional): The base URI for the identifier types. Defaults to "https://foo-bar/".
-        default_lang (str, optional): The default language for the labels. Defaults to "de".
-        set_lang (bool, optional): Whether to set the language for the labels. Defaults to False.
-        same_as (bool, optional): Whether to add owl:sameAs triples for HTTP identifiers. Defaults to True.
-        default_prefix (str, optional): The prefix for the identifier labels. Defaults to "Identifier: ".
-    Returns:
-        Graph: An RDF graph containing the generated triples.
-    """
+    type_registry: Union[TypeRegistry, None] = None,
+) -> Iterator[tuple]:
+    """yields the triples of `make_e42_identifiers` instead of adding them to a Graph"""
 
-    g = Graph()
     try:
         lang = node.attrib["{http://www.w3.org/XML/1998/namespace}lang"]
     except KeyError:
@@ -438,61 +1003,99 @@ def make_e42_identifiers(
         type_domain = f"{type_domain}/"
     app_uri = URIRef(f"{subj}/identifier/{xml_id}")
     type_uri = URIRef(f"{type_domain}idno/xml-id")
-    g.add((type_uri, RDF.type, CIDOC["E55_Type"]))
-    g.add((type_uri, RDFS.label, Literal("Identifier: XML-ID", lang="en")))
-    g.add((subj, CIDOC["P1_is_identified_by"], app_uri))
-    g.add((app_uri, RDF.type, CIDOC["E42_Identifier"]))
-    g.add((app_uri, RDFS.label, Literal(label_value, lang=lang)))
-    g.add((app_uri, RDF.value, Literal(normalize_string(xml_id))))
-    g.add((app_uri, CIDOC["P2_has_type"], type_uri))
-    for i, x in enumerate(node.xpath("./tei:idno", namespaces=NSMAP)):
+    yield from _iter_type(type_uri, "Identifier: XML-ID", type_registry=type_registry)
+    yield (subj, CIDOC_TERMS["P1_is_identified_by"], app_uri)
+    yield (app_uri, RDF.type, CIDOC_TERMS["E42_Identifier"])
+    yield (app_uri, RDFS.label, Literal(label_value, lang=lang))
+    yield (app_uri, RDF.value, Literal(normalize_string(xml_id)))
+    yield (app_uri, CIDOC_TERMS["P2_has_type"], type_uri)
+    if same_as and authority_patterns:
+        authority_matcher = compile_authority_patterns(tuple(authority_patterns))
+    for i, x in enumerate(cached_xpath(node, "./tei:idno")):
         idno_type_base_uri = f"{type_domain}idno"
         if x.text:
             idno_uri = URIRef(f"{subj}/identifier/idno/{i}")
-            g.add((subj, CIDOC["P1_is_identified_by"], idno_uri))
+            yield (subj, CIDOC_TERMS["P1_is_identified_by"], idno_uri)
             idno_type = x.get("type")
             if idno_type:
                 idno_type_base_uri = f"{idno_type_base_uri}/{idno_type}"
             idno_type = x.get("subtype")
             if idno_type:
                 idno_type_base_uri = f"{idno_type_base_uri}/{idno_type}"
-            g.add((idno_uri, RDF.type, CIDOC["E42_Identifier"]))
-            g.add((idno_uri, CIDOC["P2_has_type"], URIRef(idno_type_base_uri)))
-            g.add((URIRef(idno_type_base_uri), RDF.type, CIDOC["E55_Type"]))
+            idno_type_uri = URIRef(idno_type_base_uri)
+            yield (idno_uri, RDF.type, CIDOC_TERMS["E42_Identifier"])
+            yield (idno_uri, CIDOC_TERMS["P2_has_type"], idno_type_uri)
             label = idno_type_base_uri.split("/")[-1]
-            g.add(
-                (
-                    URIRef(idno_type_base_uri),
-                    RDFS.label,
-                    Literal(
-                        f"Identifier of type: '{label}'",
-                        lang="en",
-                    ),
-                )
+            yield from _iter_type(
+                idno_type_uri,
+                f"Identifier of type: '{label}'",
+                type_registry=type_registry,
             )
             label_value = normalize_string(f"{default_prefix}{x.text}")
-            g.add((idno_uri, RDFS.label, Literal(label_value, lang=lang)))
-            g.add((idno_uri, RDF.value, Literal(normalize_string(x.text))))
+            yield (idno_uri, RDFS.label, Literal(label_value, lang=lang))
+            yield (idno_uri, RDF.value, Literal(normalize_string(x.text)))
             if same_as:
                 if x.text.startswith("http"):
-                    normalized_uri = get_normalized_uri(x.text)
+                    normalized_uri = normalize_uri(x.text)
                     if authority_patterns:
-                        for pattern in authority_patterns:
-                            if pattern in normalized_uri:
-                                g.add((subj, OWL.sameAs, URIRef(normalized_uri)))
-                                break
+                        if authority_matcher.search(normalized_uri):
+                            yield (subj, OWL.sameAs, URIRef(normalized_uri))
                     else:
-                        g.add(
-                            (
-                                subj,
-                                OWL.sameAs,
-                                URIRef(normalized_uri),
-                            )
+                        yield (
+                            subj,
+                            OWL.sameAs,
+                            URIRef(normalized_uri),
                         )
+
+
+@instrumented
+def make_e42_identifiers(
+    subj: URIRef,
+    node: Element,
+    type_domain="https://foo-bar/",
+    default_lang="de",
+    set_lang=False,
+    same_as=True,
+    authority_patterns=authority_patterns,
+    default_prefix="Identifier: ",
+    type_registry: Union[TypeRegistry, None] = None,
+    sink=None,
+) -> Graph:
+    """
+    Creates RDF triples for E42 Identifiers based on the provided XML node.
+    Args:
+        subj (URIRef): The subject URIRef to which the identifiers are related.
+        node (Element): The XML element containing identifier information.
+        type_domain (str, optional): The base URI for the identifier types. Defaults to "https://foo-bar/".
+        default_lang (str, optional): The default language for the labels. Defaults to "de".
+        set_lang (bool, optional): Whether to set the language for the labels. Defaults to False.
+        same_as (bool, optional): Whether to add owl:sameAs triples for HTTP identifiers. Defaults to True.
+        default_prefix (str, optional): The prefix for the identifier labels. Defaults to "Identifier: ".
+        type_registry (TypeRegistry, optional): Emits the E55_Type triples of each identifier type only once.
+            Defaults to None.
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write into. Defaults to None.
+    Returns:
+        Graph: An RDF graph containing the generated triples (or the passed in sink).
+    """
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_e42_identifiers(
+            subj=subj,
+            node=node,
+            type_domain=type_domain,
+            default_lang=default_lang,
+            set_lang=set_lang,
+            same_as=same_as,
+            authority_patterns=authority_patterns,
+            default_prefix=default_prefix,
+            type_registry=type_registry,
+        ),
+        g,
+    )
     return g
 
 
-def make_occupations(
+def iter_occupations(
     subj: URIRef,
     node: Element,
     prefix="occupation",
@@ -500,20 +1103,25 @@ def make_occupations(
     default_lang="de",
     not_known_value="undefined",
     special_label=None,
-):
-    g = Graph()
+    time_spans: Union[TimeSpanRegistry, None] = None,
+) -> Generator[tuple, None, list]:
+    """yields the triples of `make_occupations` instead of adding them to a Graph
+
+    Returns (via StopIteration.value):
+        list: The URIs of the created occupations.
+    """
     occ_uris = []
     base_uri = f"{subj}/{prefix}"
-    for i, x in enumerate(node.xpath(".//tei:occupation", namespaces=NSMAP)):
+    for i, x in enumerate(cached_xpath(node, ".//tei:occupation")):
         try:
             lang = x.attrib["{http://www.w3.org/XML/1998/namespace}lang"]
         except KeyError:
             lang = default_lang
-        occ_text = normalize_string(" ".join(x.xpath(".//text()")))
+        occ_text = element_text(x)
 
         if id_xpath:
             try:
-                occ_id = x.xpath(id_xpath, namespaces=NSMAP)[0]
+                occ_id = cached_xpath(x, id_xpath)[0]
             except IndexError:
                 pass
         else:
@@ -522,27 +1130,127 @@ def make_occupations(
             occ_id = occ_id[1:]
         occ_uri = URIRef(f"{base_uri}/{occ_id}")
         occ_uris.append(occ_uri)
-        g.add((occ_uri, RDF.type, FRBROO["F51_Pursuit"]))
+        yield (occ_uri, RDF.type, FRBROO_TERMS["F51_Pursuit"])
         if special_label:
-            g.add(
-                (occ_uri, RDFS.label, Literal(f"{special_label}{occ_text}", lang=lang))
+            yield (
+                occ_uri,
+                RDFS.label,
+                Literal(f"{special_label}{occ_text}", lang=lang),
             )
         else:
-            g.add((occ_uri, RDFS.label, Literal(occ_text, lang=lang)))
-        g.add((subj, CIDOC["P14i_performed"], occ_uri))
+            yield (occ_uri, RDFS.label, Literal(occ_text, lang=lang))
+        yield (subj, CIDOC_TERMS["P14i_performed"], occ_uri)
         begin, end = extract_begin_end(x, fill_missing=False)
         if begin or end:
-            ts_uri = URIRef(f"{occ_uri}/time-span")
-            g.add((occ_uri, CIDOC["P4_has_time-span"], ts_uri))
-            g += create_e52(
-                ts_uri,
-                begin_of_begin=begin,
-                end_of_end=end,
+            yield from _iter_time_span(
+                occ_uri,
+                URIRef(f"{occ_uri}/time-span"),
+                begin,
+                end,
+                time_spans=time_spans,
                 not_known_value=not_known_value,
             )
+    return occ_uris
+
+
+@instrumented
+def make_occupations(
+    subj: URIRef,
+    node: Element,
+    prefix="occupation",
+    id_xpath=False,
+    default_lang="de",
+    not_known_value="undefined",
+    special_label=None,
+    time_spans: Union[TimeSpanRegistry, None] = None,
+    sink=None,
+):
+    g = Graph() if sink is None else sink
+    occ_uris = drain_into(
+        iter_occupations(
+            subj=subj,
+            node=node,
+            prefix=prefix,
+            id_xpath=id_xpath,
+            default_lang=default_lang,
+            not_known_value=not_known_value,
+            special_label=special_label,
+            time_spans=time_spans,
+        ),
+        g,
+    )
     return (g, occ_uris)
 
 
+def iter_affiliations(
+    subj: URIRef,
+    node: Element,
+    domain: str,
+    person_label: str,
+    org_id_xpath="./@ref",
+    org_label_xpath="",
+    lang="en",
+    add_org_object=False,
+    time_spans: Union[TimeSpanRegistry, None] = None,
+    org_registry: Union[OrgRegistry, None] = None,
+) -> Iterator[tuple]:
+    """yields the triples of `make_affiliations` instead of adding them to a Graph"""
+    for i, x in enumerate(cached_xpath(node, ".//tei:affiliation")):
+        try:
+            affiliation_id = cached_xpath(x, org_id_xpath)[0]
+        except IndexError:
+            continue
+        if affiliation_id.startswith("#"):
+            affiliation_id = affiliation_id[1:]
+        if org_registry is not None and affiliation_id in org_registry:
+            org_label = None  # taken from the registry
+        elif org_label_xpath == "":
+            org_label = element_text(x)
+        else:
+            org_label = normalize_string(" ".join(cached_xpath(x, org_label_xpath)))
+        if org_registry is None:
+            org_affiliation_uri = URIRef(f"{domain}{affiliation_id}")
+            emit_org = add_org_object
+        else:
+            org_affiliation_uri, org_label, emit_org = org_registry.resolve(
+                affiliation_id, org_label, emit=add_org_object
+            )
+        if emit_org:
+            yield (org_affiliation_uri, RDF.type, CIDOC_TERMS["E74_Group"])
+            yield (org_affiliation_uri, RDFS.label, Literal(org_label, lang=lang))
+        join_uri = URIRef(f"{subj}/joining/{affiliation_id}/{i}")
+        join_label = normalize_string(f"{person_label} joins {org_label}")
+        yield (join_uri, RDF.type, CIDOC_TERMS["E85_Joining"])
+        yield (join_uri, CIDOC_TERMS["P143_joined"], subj)
+        yield (join_uri, CIDOC_TERMS["P144_joined_with"], org_affiliation_uri)
+        yield (join_uri, RDFS.label, Literal(join_label, lang=lang))
+
+        begin, end = extract_begin_end(x, fill_missing=False)
+        if begin:
+            yield from _iter_time_span(
+                join_uri,
+                URIRef(f"{join_uri}/time-span/{begin}"),
+                begin,
+                begin,
+                time_spans=time_spans,
+            )
+        if end:
+            leave_uri = URIRef(f"{subj}/leaving/{affiliation_id}/{i}")
+            leave_label = normalize_string(f"{person_label} leaves {org_label}")
+            yield (leave_uri, RDF.type, CIDOC_TERMS["E86_Leaving"])
+            yield (leave_uri, CIDOC_TERMS["P145_separated"], subj)
+            yield (leave_uri, CIDOC_TERMS["P146_separated_from"], org_affiliation_uri)
+            yield (leave_uri, RDFS.label, Literal(leave_label, lang=lang))
+            yield from _iter_time_span(
+                leave_uri,
+                URIRef(f"{leave_uri}/time-span/{end}"),
+                end,
+                end,
+                time_spans=time_spans,
+            )
+
+
+@instrumented
 def make_affiliations(
     subj: URIRef,
     node: Element,
@@ -552,6 +1260,9 @@ def make_affiliations(
     org_label_xpath="",
     lang="en",
     add_org_object=False,
+    time_spans: Union[TimeSpanRegistry, None] = None,
+    org_registry: Union[OrgRegistry, None] = None,
+    sink=None,
 ):
     """
     Creates RDF triples representing a person's affiliations with organizations.
@@ -564,53 +1275,61 @@ def make_affiliations(
         org_label_xpath (str, optional): XPath expression to extract the organization label. Defaults to "".
         lang (str, optional): Language code for labels. Defaults to "en".
         add_org_object (bool, optional): Whether to add the organization as an object in the graph. Defaults to False.
+        time_spans (TimeSpanRegistry, optional): Links joining/leaving events to shared time-spans. Defaults to None.
+        org_registry (OrgRegistry, optional): Provides URIs and labels of the organisations and emits each
+            org object only once. Defaults to None.
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write into. Defaults to None.
     Returns:
-        Graph: An RDF graph containing the affiliations and related events.
+        Graph: An RDF graph containing the affiliations and related events (or the passed in sink).
     """
-    g = Graph()
-    for i, x in enumerate(node.xpath(".//tei:affiliation", namespaces=NSMAP)):
-        try:
-            affiliation_id = x.xpath(org_id_xpath, namespaces=NSMAP)[0]
-        except IndexError:
-            continue
-        if org_label_xpath == "":
-            org_label = normalize_string(" ".join(x.xpath(".//text()")))
-        else:
-            org_label = normalize_string(
-                " ".join(x.xpath(org_label_xpath, namespaces=NSMAP))
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_affiliations(
+            subj=subj,
+            node=node,
+            domain=domain,
+            person_label=person_label,
+            org_id_xpath=org_id_xpath,
+            org_label_xpath=org_label_xpath,
+            lang=lang,
+            add_org_object=add_org_object,
+            time_spans=time_spans,
+            org_registry=org_registry,
+        ),
+        g,
+    )
+    return g
+
+
+# axes and steps leaving the subtree an expression is evaluated on; `|` followed by `/` starts an
+# absolute expression
+_ESCAPING_XPATH = re.compile(
+    r"\.\.|\b(ancestor|ancestor-or-self|parent|preceding|following)::|\bid\(|\|\s*/"
+)
+_ATTRIBUTE_XPATH = re.compile(r"^(//?)tei:([\w.-]+)/@([\w.-]+)$")
+
+
+def _warn_escaping(expressions: list[str], stacklevel: int):
+    for expression in expressions:
+        if expression and _ESCAPING_XPATH.search(expression):
+            warnings.warn(
+                f"{expression!r} leaves the birth/death element and may scan the whole document",
+                stacklevel=stacklevel + 1,
             )
-        if affiliation_id.startswith("#"):
-            affiliation_id = affiliation_id[1:]
-        org_affiliation_uri = URIRef(f"{domain}{affiliation_id}")
-        if add_org_object:
-            g.add((org_affiliation_uri, RDF.type, CIDOC["E74_Group"]))
-            g.add((org_affiliation_uri, RDFS.label, Literal(org_label, lang=lang)))
-        join_uri = URIRef(f"{subj}/joining/{affiliation_id}/{i}")
-        join_label = normalize_string(f"{person_label} joins {org_label}")
-        g.add((join_uri, RDF.type, CIDOC["E85_Joining"]))
-        g.add((join_uri, CIDOC["P143_joined"], subj))
-        g.add((join_uri, CIDOC["P144_joined_with"], org_affiliation_uri))
-        g.add((join_uri, RDFS.label, Literal(join_label, lang=lang)))
 
-        begin, end = extract_begin_end(x, fill_missing=False)
-        if begin:
-            ts_uri = URIRef(f"{join_uri}/time-span/{begin}")
-            g.add((join_uri, CIDOC["P4_has_time-span"], ts_uri))
-            g += create_e52(ts_uri, begin_of_begin=begin, end_of_end=begin)
-        if end:
-            leave_uri = URIRef(f"{subj}/leaving/{affiliation_id}/{i}")
-            leave_label = normalize_string(f"{person_label} leaves {org_label}")
-            g.add((leave_uri, RDF.type, CIDOC["E86_Leaving"]))
-            g.add((leave_uri, CIDOC["P145_separated"], subj))
-            g.add((leave_uri, CIDOC["P146_separated_from"], org_affiliation_uri))
-            g.add((leave_uri, RDFS.label, Literal(leave_label, lang=lang)))
-            ts_uri = URIRef(f"{leave_uri}/time-span/{end}")
-            g.add((leave_uri, CIDOC["P4_has_time-span"], ts_uri))
-            g += create_e52(ts_uri, begin_of_begin=end, end_of_end=end)
-    return g
 
+@lru_cache(maxsize=256)
+def _event_lookup(expression: str) -> Union[tuple[str, str, bool], None]:
+    """returns (tag, attribute, descendants) if an expression appended to the birth/death element
+    can be resolved by iterating over the element instead of evaluating XPath"""  # noqa: E501
+    match = _ATTRIBUTE_XPATH.match(expression)
+    if match is None:
+        return None
+    slashes, name, attribute = match.groups()
+    return f"{{{NSMAP['tei']}}}{name}", attribute, slashes == "//"
 
-def make_birth_death_entities(
+
+def iter_birth_death_entities(
     subj: URIRef,
     node: Element,
     domain: str,
@@ -621,66 +1340,141 @@ def make_birth_death_entities(
     default_lang="de",
     date_node_xpath="",
     place_id_xpath="//tei:placeName/@key",
-):
-    g = Graph()
-    name_node = node.xpath(".//tei:persName[1]", namespaces=NSMAP)[0]
+    time_spans: Union[TimeSpanRegistry, None] = None,
+) -> Generator[tuple, None, tuple]:
+    """yields the triples of `make_birth_death_entities` instead of adding them to a Graph
+
+    The first tei:birth|death element is located once, `date_node_xpath` and `place_id_xpath` are
+    evaluated relative to it; `place_id_xpath` expressions like "//tei:placeName/@key" (descendants)
+    or "/tei:placeName/@key" (children) are resolved without XPath.
+
+    Returns (via StopIteration.value):
+        tuple: The URIs of the event and of its time-span (or None).
+    """  # noqa: E501
+    name_node = next(node.iter(f"{{{NSMAP['tei']}}}persName"), None)
+    if name_node is None:
+        raise IndexError(f"{subj} has no tei:persName")
     label, label_lang = make_entity_label(name_node, default_lang=default_lang)
     if event_type not in ["birth", "death"]:
-        return (g, None, None)
+        return (None, None)
     if event_type == "birth":
-        cidoc_property = CIDOC["P98_brought_into_life"]
-        cidoc_class = CIDOC["E67_Birth"]
-    else:
-        cidoc_property = CIDOC["P100_was_death_of"]
-        cidoc_class = CIDOC["E69_Death"]
-    xpath_expr = f".//tei:{event_type}[1]"
-    place_xpath = f"{xpath_expr}{place_id_xpath}"
-    if date_node_xpath != "":
-        date_xpath = f"{xpath_expr}/{date_node_xpath}"
+        cidoc_property = CIDOC_TERMS["P98_brought_into_life"]
+        cidoc_class = CIDOC_TERMS["E67_Birth"]
     else:
-        date_xpath = xpath_expr
-    try:
-        node.xpath(xpath_expr, namespaces=NSMAP)[0]
-    except IndexError as e:
+        cidoc_property = CIDOC_TERMS["P100_was_death_of"]
+        cidoc_class = CIDOC_TERMS["E69_Death"]
+    place_lookup = _event_lookup(place_id_xpath)
+    event_node = next(node.iter(f"{{{NSMAP['tei']}}}{event_type}"), None)
+    if event_node is None:
+        diagnostic(
+            "event_not_found", verbose=verbose, subj=f"{subj}", event_type=event_type
+        )
         if verbose:
-            print(subj, e)
-            return (g, None, None)
+            return (None, None)
     event_uri = URIRef(f"{subj}/{event_type}")
-    g.set((event_uri, cidoc_property, subj))
-    g.set((event_uri, RDF.type, cidoc_class))
-    g.add(
-        (event_uri, RDFS.label, Literal(f"{default_prefix} {label}", lang=label_lang))
-    )
-    try:
-        date_node = node.xpath(date_xpath, namespaces=NSMAP)[0]
-        process_date = True
-    except IndexError:
-        process_date = False
-    if process_date:
-        time_stamp_uri = URIRef(f"{event_uri}/time-span")
-        g.set((event_uri, CIDOC["P4_has_time-span"], time_stamp_uri))
+    yield (event_uri, cidoc_property, subj)
+    yield (event_uri, RDF.type, cidoc_class)
+    yield (event_uri, RDFS.label, Literal(f"{default_prefix} {label}", lang=label_lang))
+    if event_node is None:
+        return (event_uri, None)
+    if date_node_xpath == "":
+        date_node = event_node
+    else:
+        date_nodes = cached_xpath(event_node, f"./{date_node_xpath}")
+        date_node = date_nodes[0] if date_nodes else None
+    if date_node is not None:
         start, end = extract_begin_end(date_node)
-        g += create_e52(time_stamp_uri, type_uri, begin_of_begin=start, end_of_end=end)
+        time_stamp_uri = yield from _iter_time_span(
+            event_uri,
+            URIRef(f"{event_uri}/time-span"),
+            start,
+            end,
+            time_spans=time_spans,
+            type_uri=type_uri,
+        )
     else:
         time_stamp_uri = None
-    try:
-        place_node = node.xpath(place_xpath, namespaces=NSMAP)[0]
-        process_place = True
-    except IndexError:
-        process_place = False
-    if process_place:
+    if place_lookup is None:
+        place_ids = cached_xpath(event_node, f".{place_id_xpath}")
+        place_node = place_ids[0] if place_ids else None
+    else:
+        tag, attribute, descendants = place_lookup
+        candidates = (
+            event_node.iterdescendants(tag)
+            if descendants
+            else event_node.iterchildren(tag)
+        )
+        place_node = next(
+            (x.get(attribute) for x in candidates if attribute in x.attrib), None
+        )
+    if place_node is not None:
         if place_node.startswith("#"):
             place_node = place_node[1:]
         place_uri = URIRef(f"{domain}{place_node}")
-        g.add((event_uri, CIDOC["P7_took_place_at"], place_uri))
+        yield (event_uri, CIDOC_TERMS["P7_took_place_at"], place_uri)
+    return (event_uri, time_stamp_uri)
+
+
+@instrumented
+def make_birth_death_entities(
+    subj: URIRef,
+    node: Element,
+    domain: str,
+    type_uri: URIRef = None,
+    event_type="birth",
+    verbose=False,
+    default_prefix="Geburt von",
+    default_lang="de",
+    date_node_xpath="",
+    place_id_xpath="//tei:placeName/@key",
+    time_spans: Union[TimeSpanRegistry, None] = None,
+    sink=None,
+):
+    # caller -> instrumented wrapper (-> Collector.call) -> this function
+    stacklevel = 3 if active_collector() is None else 4
+    _warn_escaping([place_id_xpath, date_node_xpath], stacklevel)
+    g = Graph() if sink is None else sink
+    event_uri, time_stamp_uri = drain_into(
+        iter_birth_death_entities(
+            subj=subj,
+            node=node,
+            domain=domain,
+            type_uri=type_uri,
+            event_type=event_type,
+            verbose=verbose,
+            default_prefix=default_prefix,
+            default_lang=default_lang,
+            date_node_xpath=date_node_xpath,
+            place_id_xpath=place_id_xpath,
+            time_spans=time_spans,
+        ),
+        g,
+    )
     return (g, event_uri, time_stamp_uri)
 
 
+def iter_p89(
+    subj: URIRef,
+    node: Element,
+    domain: URIRef,
+    location_id_xpath="./tei:location[@type='located_in_place']/tei:placeName/@key",
+) -> Iterator[tuple]:
+    """yields the triples of `p89_falls_within` instead of adding them to a Graph"""
+    try:
+        range_id = cached_xpath(node, location_id_xpath)[0]
+    except IndexError:
+        return
+    range_uri = URIRef(f"{domain}{range_id}")
+    yield (subj, CIDOC_TERMS["P89_falls_within"], range_uri)
+
+
+@instrumented
 def p89_falls_within(
     subj: URIRef,
     node: Element,
     domain: URIRef,
     location_id_xpath="./tei:location[@type='located_in_place']/tei:placeName/@key",
+    sink=None,
 ) -> Graph:
     """connects to places (E53_Place) with P89_falls_within
 
@@ -690,20 +1484,61 @@ def p89_falls_within(
         domain (URIRef): An URI used to create the ID of the domain object: {domain}{ID of target object}
         location_id_xpath (str, optional): An XPath expression pointing to the parent's place ID.
         Defaults to "./tei:location[@type='located_in_place']/tei:placeName/@key".
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write the triples into.
+        Defaults to None.
 
     Returns:
-        Graph: A Graph object linking two places via P89_falls_within
+        Graph: A Graph object linking two places via P89_falls_within (or the passed in sink)
     """
-    g = Graph()
-    try:
-        range_id = node.xpath(location_id_xpath, namespaces=NSMAP)[0]
-    except IndexError:
-        return g
-    range_uri = URIRef(f"{domain}{range_id}")
-    g.add((subj, CIDOC["P89_falls_within"], range_uri))
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_p89(
+            subj=subj,
+            node=node,
+            domain=domain,
+            location_id_xpath=location_id_xpath,
+        ),
+        g,
+    )
     return g
 
 
+def iter_p95i(
+    uri: URIRef,
+    start_date=None,
+    end_date=None,
+    label="Institution wurde gegründet",
+    end_label="Institution wurde aufgelöst",
+    label_lang="de",
+    time_spans: Union[TimeSpanRegistry, None] = None,
+) -> Iterator[tuple]:
+    """yields the triples of `p95i_was_formed_by` instead of adding them to a Graph"""
+    formation_uri = URIRef(f"{uri}/formation-event")
+    yield (uri, CIDOC_TERMS["P95i_was_formed_by"], formation_uri)
+    yield (formation_uri, RDF.type, CIDOC_TERMS["E66_Formation"])
+    yield (formation_uri, RDFS.label, Literal(label, lang=label_lang))
+    if start_date:
+        yield from _iter_time_span(
+            formation_uri,
+            URIRef(f"{formation_uri}/formation-time-span"),
+            start_date,
+            start_date,
+            time_spans=time_spans,
+        )
+    if end_date:
+        dissolution_uri = URIRef(f"{uri}/dissolution-event")
+        yield (dissolution_uri, RDF.type, CIDOC_TERMS["E68_Dissolution"])
+        yield (dissolution_uri, RDFS.label, Literal(end_label, lang=label_lang))
+        yield from _iter_time_span(
+            dissolution_uri,
+            URIRef(f"{dissolution_uri}/dissolution-time-span"),
+            end_date,
+            end_date,
+            time_spans=time_spans,
+        )
+
+
+@instrumented
 def p95i_was_formed_by(
     uri: URIRef,
     start_date=None,
@@ -711,6 +1546,8 @@ def p95i_was_formed_by(
     label="Institution wurde gegründet",
     end_label="Institution wurde aufgelöst",
     label_lang="de",
+    time_spans: Union[TimeSpanRegistry, None] = None,
+    sink=None,
 ):
     """
     Create a RDF graph representing the formation event of an institution.
@@ -720,29 +1557,111 @@ def p95i_was_formed_by(
         end_date (str, optional): The end date of the formation event. Defaults to None.
         label (str, optional): The label for the formation event. Defaults to "Institution wurde gegründet".
         label_lang (str, optional): The language of the label. Defaults to "de".
+        time_spans (TimeSpanRegistry, optional): Links the events to shared time-spans. Defaults to None.
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write into. Defaults to None.
     Returns:
-        Graph: An RDF graph containing the formation event information.
+        Graph: An RDF graph containing the formation event information (or the passed in sink).
     """
-    g = Graph()
-    formation_uri = URIRef(f"{uri}/formation-event")
-    g.add((uri, CIDOC["P95i_was_formed_by"], formation_uri))
-    g.add((formation_uri, RDF.type, CIDOC["E66_Formation"]))
-    g.add((formation_uri, RDFS.label, Literal(label, lang=label_lang)))
-    if start_date:
-        start_uri = URIRef(f"{formation_uri}/formation-time-span")
-        g.add((formation_uri, CIDOC["P4_has_time-span"], start_uri))
-        g += create_e52(start_uri, begin_of_begin=start_date, end_of_end=start_date)
-    if end_date:
-        dissolution_uri = URIRef(f"{uri}/dissolution-event")
-        g.add((dissolution_uri, RDF.type, CIDOC["E68_Dissolution"]))
-        g.add((dissolution_uri, RDFS.label, Literal(end_label, lang=label_lang)))
-        end_uri = URIRef(f"{dissolution_uri}/dissolution-time-span")
-        g.add((dissolution_uri, CIDOC["P4_has_time-span"], end_uri))
-        g += create_e52(end_uri, begin_of_begin=end_date, end_of_end=end_date)
+    g = Graph() if sink is None else sink
+    drain_into(
+        iter_p95i(
+            uri=uri,
+            start_date=start_date,
+            end_date=end_date,
+            label=label,
+            end_label=end_label,
+            label_lang=label_lang,
+            time_spans=time_spans,
+        ),
+        g,
+    )
     return g
 
 
-def teidoc_as_f24_publication_expression(
+def _collect_mentions(nodes: Iterable[Element]) -> list:
+    mentions = []
+    for x in nodes:
+        ref = x.attrib["ref"]
+        for y in ref.split(" "):
+            type = x.get("type", "unknown")
+            mentions.append([check_for_hash(y), type])
+    return mentions
+
+
+def _read_f24_tree(
+    source: Union[str, io.BytesIO], title_xpath: str, mentions_xpath: str
+) -> tuple:
+    tree = TeiReader(source).tree if isinstance(source, str) else ET.parse(source)
+    title_label = element_text(cached_xpath(tree, title_xpath)[0], separator="")
+    mentions = _collect_mentions(cached_xpath(tree, mentions_xpath))
+    return title_label, mentions
+
+
+def _read_f24_streaming(
+    source: Union[str, io.BytesIO], title_xpath: str, mentions_xpath: str
+) -> tuple:
+    """reads title and mentions with iterparse, clearing every element once it is processed
+
+    The title is looked up when the tei:teiHeader is complete. Mentions are tested with a `self::`
+    version of `mentions_xpath` when they end; elements inside a candidate (e.g. a tei:rs) are kept
+    until the candidate is tested, so predicates may use the candidate's attributes and descendants
+    but not its ancestors or siblings.
+    """  # noqa: E501
+    match = re.match(r"^\.//([\w.-]+):([\w.-]+)(\[.*\])?$", mentions_xpath, re.DOTALL)
+    if match is None or match.group(1) not in NSMAP:
+        raise ValueError(
+            "streaming needs a mentions_xpath like './/tei:rs[predicates]', "
+            f"got: {mentions_xpath}"
+        )
+    prefix, local_name, predicates = match.groups()
+    candidate_tag = f"{{{NSMAP[prefix]}}}{local_name}"
+    is_mention = compile_xpath(f"self::{prefix}:{local_name}{predicates or ''}")
+    header_tag = f"{{{NSMAP['tei']}}}teiHeader"
+    root = None
+    title_label = None
+    header_done = False
+    in_header = False
+    # one slot per candidate in document order, filled when the candidate ends
+    matches = []
+    open_candidates = []
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == candidate_tag:
+                open_candidates.append(len(matches))
+                matches.append(None)
+            elif root is None:
+                root = elem
+            elif tag == header_tag:
+                in_header = True
+            continue
+        if tag == candidate_tag:
+            index = open_candidates.pop()
+            if is_mention(elem):
+                matches[index] = _collect_mentions([elem])
+            # the header is kept until the title is read, e.g. an rs in the title
+            if open_candidates or in_header:
+                continue
+        elif tag == header_tag:
+            in_header = False
+            header_done = True
+            title_nodes = cached_xpath(root, title_xpath)
+            if not title_nodes:
+                raise IndexError(f"no title found with {title_xpath}")
+            title_label = element_text(title_nodes[0], separator="")
+        elif in_header or open_candidates or elem is root:
+            continue
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    if not header_done:
+        title_label = element_text(cached_xpath(root, title_xpath)[0], separator="")
+    return title_label, [y for x in matches if x for y in x]
+
+
+def iter_f24_publication_expression(
     path_to_file: str,
     domain: str,
     title_xpath=".//tei:titleStmt/tei:title[1]",
@@ -752,52 +1671,45 @@ def teidoc_as_f24_publication_expression(
     type_uri="https://pfp-schema.acdh.oeaw.ac.at/types/tei-document",
     type_label="A TEI/XML encoded text",
     type_lang="en",
-) -> tuple[URIRef, Graph, list]:
+    streaming=False,
+    type_registry: Union[TypeRegistry, None] = None,
+    data: Union[bytes, None] = None,
+) -> Generator[tuple, None, tuple]:
+    """yields the triples of `teidoc_as_f24_publication_expression` instead of adding them to a Graph
+
+    Returns (via StopIteration.value):
+        tuple: The URI of the publication expression and the list of mentions.
     """
-    Converts a TEI document into an RDF graph representing a CIDOC CRM F24 Publication Expression.
-    Args:
-        path_to_file (str): Path to the TEI XML file.
-        domain (str): Base URI domain for the generated RDF resources.
-        title_xpath (str): XPath expression to extract the title from the TEI document.
-        mentions_xpath (str, optional): XPath expression to extract mentions of entities (default is ".//tei:rs[@type='person' or @type='place' or @type='org' and @ref]").
-        add_mentions (bool, optional): Whether to add mentions of entities (default is True).
-        default_lang (str, optional): Default language for literals (default is "de").
-        type_uri (str, optional): URI for the type of the TEI document (default is "https://pfp-schema.acdh.oeaw.ac.at/types/tei-document").
-        type_label (str, optional): Label for the type of the TEI document (default is "A TEI/XML encoded text").
-        type_lang (str, optional): Language for the type label (default is "en").
-    Returns:
-        tuple[URIRef, Graph, list]: A tuple containing the URI of the publication expression, the RDF graph and a list of mentioned entity-ids and their type.
-    """  # noqa: E501
 
     domain = remove_trailing_slash(domain)
-    g = Graph()
     doc_id = os.path.split(path_to_file)[-1]
     subj = URIRef(f"{domain}/{doc_id}")
-    g.add((subj, RDF.type, SARI_FRBROO["F24_Publication_Expression"]))
-    doc = TeiReader(path_to_file)
+    yield (subj, RDF.type, SARI_FRBROO_TERMS["F24_Publication_Expression"])
+    source = path_to_file if data is None else io.BytesIO(data)
+    if streaming:
+        title_label, mentions = _read_f24_streaming(source, title_xpath, mentions_xpath)
+    else:
+        title_label, mentions = _read_f24_tree(source, title_xpath, mentions_xpath)
 
     # title
-    title_label = extract_fulltext(doc.any_xpath(title_xpath)[0])
     title_literal = Literal(title_label, lang=default_lang)
-    g.add((subj, RDFS.label, title_literal))
+    yield (subj, RDFS.label, title_literal)
 
     # subj-type
     subj_type_uri = URIRef(type_uri)
-    g.add((subj, CIDOC["P2_has_type"], subj_type_uri))
-    g.add((subj_type_uri, RDF.type, CIDOC["E55_Type"]))
-    g.add((subj_type_uri, RDFS.label, Literal(type_label, lang=type_lang)))
+    yield (subj, CIDOC_TERMS["P2_has_type"], subj_type_uri)
+    yield from _iter_type(subj_type_uri, type_label, type_lang, type_registry)
 
     # identifier
     id_uri = URIRef(f"{subj}/identifier")
-    g.add((subj, CIDOC["P1_is_identified_by"], id_uri))
-    g.add((id_uri, RDF.type, CIDOC["E42_Identifier"]))
-    g.add((id_uri, RDFS.label, Literal(doc_id)))
+    yield (subj, CIDOC_TERMS["P1_is_identified_by"], id_uri)
+    yield (id_uri, RDF.type, CIDOC_TERMS["E42_Identifier"])
+    yield (id_uri, RDFS.label, Literal(doc_id))
 
     # id-type
     id_type_uri = URIRef(f"{type_uri}/file-name")
-    g.add((id_uri, CIDOC["P2_has_type"], id_type_uri))
-    g.add((id_type_uri, RDF.type, CIDOC["E55_Type"]))
-    g.add((id_type_uri, RDFS.label, Literal("Filename", lang="en")))
+    yield (id_uri, CIDOC_TERMS["P2_has_type"], id_type_uri)
+    yield from _iter_type(id_type_uri, "Filename", type_registry=type_registry)
 
     # <https://foo/bar/dworg00001/identifier/DWorg00001> a ns1:E42_Identifier ;
     # rdfs:label "sumsibumsi 123: DWorg00001"@it ;
@@ -807,22 +1719,71 @@ def teidoc_as_f24_publication_expression(
     # appellation
     app_uri = URIRef(f"{subj}/appellation")
     app_type_uri = URIRef(f"{subj_type_uri}/appellation")
-    g.add((app_uri, RDF.type, CIDOC["E33_E41_Linguistic_Appellation"]))
-    g.add((app_uri, RDFS.label, title_literal))
-    g.add((app_uri, CIDOC["P2_has_type"], app_type_uri))
-    g.add((subj, CIDOC["P1_is_identified_by"], app_uri))
-    g.add((app_type_uri, RDF.type, CIDOC["E55_Type"]))
-    g.add((app_type_uri, RDFS.label, Literal("Document Title", lang="en")))
+    yield (app_uri, RDF.type, CIDOC_TERMS["E33_E41_Linguistic_Appellation"])
+    yield (app_uri, RDFS.label, title_literal)
+    yield (app_uri, CIDOC_TERMS["P2_has_type"], app_type_uri)
+    yield (subj, CIDOC_TERMS["P1_is_identified_by"], app_uri)
+    yield from _iter_type(app_type_uri, "Document Title", type_registry=type_registry)
 
     # mentions
-    mentions = []
-    for x in doc.any_xpath(mentions_xpath):
-        ref = x.attrib["ref"]
-        for y in ref.split(" "):
-            type = x.get("type", "unknown")
-            mentions.append([check_for_hash(y), type])
     if add_mentions:
         for x in mentions:
-            g.add((subj, CIDOC["P67_refers_to"], URIRef(f"{domain}/{x[0]}")))
+            yield (subj, CIDOC_TERMS["P67_refers_to"], URIRef(f"{domain}/{x[0]}"))
+
+    return subj, mentions
 
+
+@instrumented
+def teidoc_as_f24_publication_expression(
+    path_to_file: str,
+    domain: str,
+    title_xpath=".//tei:titleStmt/tei:title[1]",
+    mentions_xpath=".//tei:rs[@ref and (@type='person' or @type='place' or @type='org')]",
+    add_mentions=True,
+    default_lang="de",
+    type_uri="https://pfp-schema.acdh.oeaw.ac.at/types/tei-document",
+    type_label="A TEI/XML encoded text",
+    type_lang="en",
+    streaming=False,
+    type_registry: Union[TypeRegistry, None] = None,
+    data: Union[bytes, None] = None,
+    sink=None,
+) -> tuple[URIRef, Graph, list]:
+    """
+    Converts a TEI document into an RDF graph representing a CIDOC CRM F24 Publication Expression.
+    Args:
+        path_to_file (str): Path to the TEI XML file.
+        domain (str): Base URI domain for the generated RDF resources.
+        title_xpath (str): XPath expression to extract the title from the TEI document.
+        mentions_xpath (str, optional): XPath expression to extract mentions of entities (default is ".//tei:rs[@type='person' or @type='place' or @type='org' and @ref]").
+        add_mentions (bool, optional): Whether to add mentions of entities (default is True).
+        default_lang (str, optional): Default language for literals (default is "de").
+        type_uri (str, optional): URI for the type of the TEI document (default is "https://pfp-schema.acdh.oeaw.ac.at/types/tei-document").
+        type_label (str, optional): Label for the type of the TEI document (default is "A TEI/XML encoded text").
+        type_lang (str, optional): Language for the type label (default is "en").
+        streaming (bool, optional): Read the file with lxml's iterparse instead of building a TeiReader DOM, so memory is bounded by element rather than document size. The title must be found in the tei:teiHeader and mentions_xpath has to look like ".//prefix:name[predicates]", otherwise a ValueError is raised (default is False).
+        type_registry (TypeRegistry, optional): Emits the E55_Type triples of the document, file-name and title types only once, e.g. for many documents written into one sink (default is None).
+        data (bytes, optional): The content of the file if it was already read, `path_to_file` is then only used for the document id (default is None).
+        sink (Graph, optional): A Graph (or any object with an `add(triple)` method) to write the triples into (default is None).
+    Returns:
+        tuple[URIRef, Graph, list]: A tuple containing the URI of the publication expression, the RDF graph (or the passed in sink) and a list of mentioned entity-ids and their type.
+    """  # noqa: E501
+    g = Graph() if sink is None else sink
+    subj, mentions = drain_into(
+        iter_f24_publication_expression(
+            path_to_file=path_to_file,
+            domain=domain,
+            title_xpath=title_xpath,
+            mentions_xpath=mentions_xpath,
+            add_mentions=add_mentions,
+            default_lang=default_lang,
+            type_uri=type_uri,
+            type_label=type_label,
+            type_lang=type_lang,
+            streaming=streaming,
+            type_registry=type_registry,
+            data=data,
+        ),
+        g,
+    )
     return subj, g, mentions
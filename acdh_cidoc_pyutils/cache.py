@@ -0,0 +1,225 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+from functools import partial
+from importlib import metadata
+from typing import Callable, Union
+
+from rdflib import Graph, URIRef
+
+from acdh_cidoc_pyutils import teidoc_as_f24_publication_expression
+from acdh_cidoc_pyutils.parallel import convert_entities
+from acdh_cidoc_pyutils.writers import NTriplesWriter
+
+
+def library_version() -> str:
+    """returns the installed version of acdh_cidoc_pyutils
+
+    For a checkout that is not installed a digest of the package's source files is returned instead,
+    so changes to the code still invalidate a BuildCache.
+    """  # noqa: E501
+    try:
+        return metadata.version("acdh_cidoc_pyutils")
+    except metadata.PackageNotFoundError:
+        pass
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for file_name in sorted(os.listdir(package_dir)):
+        if file_name.endswith(".py"):
+            with open(os.path.join(package_dir, file_name), "rb") as f:
+                digest.update(f.read())
+    return f"src-{digest.hexdigest()[:12]}"
+
+
+def file_digest(path: Union[str, os.PathLike], block_size=1 << 20) -> str:
+    """sha256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def converter_name(converter: Callable) -> str:
+    """a stable name of a converter function, e.g. "acdh_cidoc_pyutils.make_appellations"
+
+    functools.partial objects are resolved to their function plus their bound arguments.
+    """
+    if isinstance(converter, partial):
+        args = json.dumps(
+            [converter.args, converter.keywords], sort_keys=True, default=repr
+        )
+        return f"{converter_name(converter.func)}{args}"
+    return f"{converter.__module__}.{converter.__qualname__}"
+
+
+def _add_nt(data: bytes, sink):
+    if isinstance(sink, NTriplesWriter):
+        sink.write_raw(data)
+    elif isinstance(sink, Graph):
+        sink.parse(data=data.decode("utf-8"), format="nt")
+    else:
+        for triple in Graph().parse(data=data.decode("utf-8"), format="nt"):
+            sink.add(triple)
+
+
+class BuildCache:
+    """An on-disk cache of converted files for incremental rebuilds.
+
+    Entries are keyed by the sha256 of the input file's content, the converter and its arguments and
+    are stored as N-Triples (plus a small JSON file with e.g. the mentions of a document) in a
+    sub-directory per library version, so upgrading acdh_cidoc_pyutils starts with an empty cache.
+
+    Arguments are serialized with json (falling back to repr), so only arguments with a stable
+    representation (strings, numbers, lists, dicts, ...) lead to cache hits.
+
+    Args:
+        directory (Union[str, os.PathLike]): The root directory of the cache.
+        version (Union[str, None], optional): Overrides the library version used to separate
+            entries. Defaults to None (`library_version()`).
+    """  # noqa: E501
+
+    def __init__(
+        self, directory: Union[str, os.PathLike], version: Union[str, None] = None
+    ):
+        self.directory = os.fspath(directory)
+        self.version = library_version() if version is None else version
+        self.path = os.path.join(self.directory, self.version)
+        os.makedirs(self.path, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._used = set()
+
+    def key(
+        self, path: Union[str, os.PathLike], converter: Callable, args: dict
+    ) -> str:
+        """builds the cache key of converting `path` with `converter(path, **args)`"""
+        digest = hashlib.sha256(file_digest(path).encode("utf-8"))
+        digest.update(converter_name(converter).encode("utf-8"))
+        digest.update(json.dumps(args, sort_keys=True, default=repr).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.path, key[:2], key)
+        return f"{base}.nt", f"{base}.json"
+
+    def get(self, key: str) -> Union[tuple[bytes, dict], None]:
+        """returns the stored N-Triples and metadata of a key or None"""
+        nt_path, meta_path = self._entry(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(nt_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.add(key)
+        return data, meta
+
+    def put(self, key: str, data: bytes, meta: Union[dict, None] = None):
+        """stores N-Triples and JSON serializable metadata under a key"""
+        nt_path, meta_path = self._entry(key)
+        os.makedirs(os.path.dirname(nt_path), exist_ok=True)
+        for target, content in [
+            (nt_path, data),
+            (meta_path, json.dumps(meta or {}).encode("utf-8")),
+        ]:
+            tmp_path = f"{target}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, target)
+        self._used.add(key)
+
+    def invalidate(self, key: str) -> bool:
+        """removes a single entry, returns True if it existed"""
+        existed = False
+        for file_path in self._entry(key):
+            try:
+                os.remove(file_path)
+                existed = True
+            except FileNotFoundError:
+                pass
+        self._used.discard(key)
+        return existed
+
+    def clear(self):
+        """removes all entries of all versions"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
+        self._used.clear()
+
+    def prune(self, keep_unused=False) -> int:
+        """removes the entries of other library versions and, unless `keep_unused`, all entries of
+        this version that were neither read nor written by this BuildCache instance
+
+        Returns:
+            int: The number of removed version directories and entries
+        """  # noqa: E501
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name != self.version:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+                removed += 1
+        if keep_unused:
+            return removed
+        for sub_dir in os.listdir(self.path):
+            for file_name in os.listdir(os.path.join(self.path, sub_dir)):
+                if file_name.endswith(".json") and file_name[:-5] not in self._used:
+                    self.invalidate(file_name[:-5])
+                    removed += 1
+        return removed
+
+    def f24(self, path_to_file: str, domain: str, sink=None, **kwargs):
+        """cached `teidoc_as_f24_publication_expression`, takes and returns the same arguments and values
+
+        On a cache hit the stored triples are added to `sink` (an NTriplesWriter gets the raw bytes).
+        The file name is part of the key, as the URI and identifier of the document are built from it.
+        `type_registry` and `data` are not supported: a registry has no stable key and would not be
+        updated on a hit, and `data` replaces the content the key is computed from.
+        """  # noqa: E501
+        for name in ["type_registry", "data"]:
+            if kwargs.get(name) is not None:
+                raise ValueError(f"BuildCache.f24 does not support {name}")
+        g = Graph() if sink is None else sink
+        args = {
+            "domain": domain,
+            "file_name": os.path.basename(path_to_file),
+            **kwargs,
+        }
+        key = self.key(path_to_file, teidoc_as_f24_publication_expression, args)
+        cached = self.get(key)
+        if cached is None:
+            stream = io.BytesIO()
+            writer = NTriplesWriter(stream)
+            subj, _, mentions = teidoc_as_f24_publication_expression(
+                path_to_file, domain, sink=writer, **kwargs
+            )
+            writer.close()
+            data = stream.getvalue()
+            self.put(key, data, {"subj": subj, "mentions": mentions})
+        else:
+            data, meta = cached
+            subj, mentions = meta["subj"], meta["mentions"]
+        _add_nt(data, g)
+        return URIRef(subj), g, mentions
+
+    def entities(
+        self, path: Union[str, os.PathLike], handlers: list, domain: str, **kwargs
+    ) -> bytes:
+        """cached `convert_entities` of a register file, returns all N-Triples as bytes"""
+        args = {
+            "handlers": [converter_name(x) for x in handlers],
+            "domain": domain,
+            **{k: v for k, v in kwargs.items() if k != "workers"},
+        }
+        key = self.key(path, convert_entities, args)
+        cached = self.get(key)
+        if cached is not None:
+            return cached[0]
+        data = b"".join(convert_entities(path, handlers, domain, **kwargs))
+        self.put(key, data)
+        return data
@@ -0,0 +1,236 @@
+"""Converts TEI registers (tei:listPerson|listPlace|listOrg|listBibl) with the standard builders.
+
+cidoc-convert listperson.xml listplace.xml --domain https://foo/bar/ --output rdf/entities
+cidoc-convert listperson.xml --domain https://foo/bar/ --workers 8 --shard-size 1000000 --compression zstd
+"""  # noqa: E501
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+from typing import Iterator, Union
+
+import lxml.etree as ET
+from lxml.etree import Element
+from rdflib import URIRef
+
+from acdh_cidoc_pyutils import (
+    coordinates_to_p168,
+    make_affiliations,
+    make_appellations,
+    make_birth_death_entities,
+    make_e42_identifiers,
+    make_entity_label,
+    make_occupations,
+    p89_falls_within,
+)
+from acdh_cidoc_pyutils.namespaces import NSMAP
+from acdh_cidoc_pyutils.parallel import convert_entities
+from acdh_cidoc_pyutils.readers import ENTITY_TAGS, iter_register_entities
+from acdh_cidoc_pyutils.writers import NTriplesWriter, ShardedWriter
+
+PERS_NAME = f"{{{NSMAP['tei']}}}persName"
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+EVENTS = [("birth", "Geburt von"), ("death", "Tod von")]
+
+
+def convert_standard(
+    subj: URIRef,
+    node: Element,
+    domain: str,
+    type_domain: str,
+    default_lang="de",
+    sink=None,
+):
+    """runs the standard builders matching the element name of an entity
+
+    All entities get appellations and identifiers; tei:person elements also birth and death events
+    (if present), occupations and affiliations, tei:place elements coordinates and P89_falls_within.
+    Used as handler by `cidoc-convert`, e.g. `partial(convert_standard, domain=..., type_domain=...)`.
+    """  # noqa: E501
+    tag = ET.QName(node).localname
+    make_appellations(
+        subj, node, type_domain=type_domain, default_lang=default_lang, sink=sink
+    )
+    make_e42_identifiers(subj, node, type_domain=type_domain, sink=sink)
+    if tag == "person":
+        name_node = next(node.iter(PERS_NAME), None)
+        if name_node is None:
+            person_label = subj.split("/")[-1]
+        else:
+            person_label, _ = make_entity_label(name_node, default_lang=default_lang)
+            for event_type, default_prefix in EVENTS:
+                if next(node.iter(f"{{{NSMAP['tei']}}}{event_type}"), None) is None:
+                    continue
+                make_birth_death_entities(
+                    subj,
+                    node,
+                    domain,
+                    event_type=event_type,
+                    default_prefix=default_prefix,
+                    default_lang=default_lang,
+                    sink=sink,
+                )
+        make_occupations(subj, node, default_lang=default_lang, sink=sink)
+        make_affiliations(subj, node, domain, person_label, sink=sink)
+    elif tag == "place":
+        coordinates_to_p168(subj, node, sink=sink)
+        p89_falls_within(subj, node, domain, sink=sink)
+
+
+class Progress:
+    """prints converted entities, triples and throughput to a stream (stderr)"""
+
+    def __init__(self, stream=None, interval=1.0, enabled=True):
+        self.stream = sys.stderr if stream is None else stream
+        self.interval = interval
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.entities_read = 0
+        self.skipped = 0
+        self.entities = 0
+        self.triples = 0
+        self._printed = 0.0
+
+    def line(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.triples / elapsed if elapsed else 0.0
+        skipped = f", {self.skipped} skipped (no @xml:id)" if self.skipped else ""
+        return (
+            f"{self.entities} entities{skipped}, {self.triples} triples, "
+            f"{elapsed:.1f}s, {rate:,.0f} triples/s"
+        )
+
+    def update(self, entities: int, triples: int, final=False):
+        self.entities = entities
+        self.triples = triples
+        now = time.perf_counter()
+        if not self.enabled or (not final and now - self._printed < self.interval):
+            return
+        self._printed = now
+        end = "\n" if final else ""
+        print(f"\r{self.line()}", end=end, file=self.stream, flush=True)
+
+
+def _counted_entities(
+    paths: list, progress: Progress, huge_tree=False, nested=True
+) -> Iterator[Element]:
+    """streams the entities of all paths, skipping (and counting) the ones without @xml:id"""
+    for path in paths:
+        for node in iter_register_entities(
+            path, ENTITY_TAGS, huge_tree=huge_tree, nested=nested
+        ):
+            if XML_ID not in node.attrib:
+                # e.g. a tei:bibl in the tei:note of a person
+                progress.skipped += 1
+                continue
+            progress.entities_read += 1
+            yield node
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cidoc-convert", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("inputs", nargs="+", help="TEI register files")
+    parser.add_argument(
+        "-d", "--domain", required=True, help="entity URIs are {domain}{@xml:id}"
+    )
+    parser.add_argument(
+        "--type-domain", help="base URI of the E55_Types, defaults to {domain}types/"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="entities",
+        help="output path without suffix, shards get -00000, -00001, ... appended",
+    )
+    parser.add_argument("-f", "--format", choices=["nt", "nq"], default="nt")
+    parser.add_argument("--graph-name", help="graph of N-Quads, defaults to --domain")
+    parser.add_argument(
+        "-c", "--compression", choices=["gzip", "zstd", "none"], default="gzip"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=0,
+        help="triples per output file, 0 writes a single file",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="worker processes, defaults to the CPU count"
+    )
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--lang", default="de", help="default language of labels")
+    parser.add_argument("--lower-ids", action="store_true", help="lowercase @xml:id")
+    parser.add_argument(
+        "--huge-tree", action="store_true", help="lift lxml's size limits"
+    )
+    parser.add_argument(
+        "--no-nested",
+        action="store_true",
+        help="skip entities nested in other entities, e.g. a tei:bibl in a tei:person",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress")
+    return parser
+
+
+def main(argv: Union[list, None] = None) -> int:
+    args = build_parser().parse_args(argv)
+    domain = args.domain
+    type_domain = args.type_domain or f"{domain.rstrip('/')}/types/"
+    graph_name = None
+    if args.format == "nq":
+        graph_name = URIRef(args.graph_name or domain)
+    compression = None if args.compression == "none" else args.compression
+    handler = partial(
+        convert_standard,
+        domain=domain,
+        type_domain=type_domain,
+        default_lang=args.lang,
+    )
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    if args.shard_size > 0:
+        writer = ShardedWriter(
+            args.output,
+            shard_size=args.shard_size,
+            format=args.format,
+            compression=compression,
+        )
+    else:
+        output_path = (
+            f"{args.output}.{args.format}{ShardedWriter.suffixes[compression]}"
+        )
+        writer = NTriplesWriter(
+            output_path, format=args.format, compression=compression
+        )
+    progress = Progress(enabled=not args.quiet)
+    entities = _counted_entities(
+        args.inputs, progress, huge_tree=args.huge_tree, nested=not args.no_nested
+    )
+    chunks = 0
+    with writer:
+        for data in convert_entities(
+            entities,
+            [handler],
+            domain,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            lower_ids=args.lower_ids,
+            graph_name=graph_name,
+        ):
+            writer.write_raw(data)
+            chunks += 1
+            # every chunk but the last one has chunk_size entities
+            converted = min(chunks * args.chunk_size, progress.entities_read)
+            progress.update(converted, writer.count)
+    progress.update(progress.entities_read, writer.count, final=True)
+    paths = writer.paths if args.shard_size > 0 else [output_path]
+    if not args.quiet:
+        for path in paths:
+            print(path, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import time
+from collections import Counter, deque
+from functools import wraps
+from typing import Union
+
+logger = logging.getLogger("acdh_cidoc_pyutils")
+
+# the collector of the current `with Collector():` block, None while instrumentation is off
+_active = None
+
+UNATTRIBUTED = "(no builder)"
+
+
+class Collector:
+    """Collects per-builder statistics while it is active (`with Collector() as stats:`).
+
+    For every builder called inside the block it records calls, cumulative wall time (including nested
+    builders), emitted triples and XPath evaluations, plus the diagnostic events (e.g. a relation type
+    missing from the lookup dict) the builders report. Collectors are process local and not meant to
+    be shared between threads; in `convert_entities` with workers > 1 only the main process is measured.
+
+    Args:
+        max_event_details (int, optional): Number of most recent diagnostic events kept with their
+            details in `event_details`. Defaults to 1000.
+    """  # noqa: E501
+
+    def __init__(self, max_event_details=1000):
+        self.builders = {}
+        self.events = Counter()
+        self.event_details = deque(maxlen=max_event_details)
+        self._stack = []
+        self._previous = []
+
+    def __enter__(self):
+        global _active
+        self._previous.append(_active)
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        _active = self._previous.pop()
+
+    def _stats(self, builder: str) -> dict:
+        try:
+            return self.builders[builder]
+        except KeyError:
+            stats = {"calls": 0, "seconds": 0.0, "triples": 0, "xpath": 0}
+            self.builders[builder] = stats
+            return stats
+
+    @property
+    def current(self) -> str:
+        return self._stack[-1] if self._stack else UNATTRIBUTED
+
+    def call(self, builder: str, func, args, kwargs):
+        stats = self._stats(builder)
+        stats["calls"] += 1
+        self._stack.append(builder)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats["seconds"] += time.perf_counter() - start
+            self._stack.pop()
+
+    def count_triple(self):
+        self._stats(self.current)["triples"] += 1
+
+    def count_xpath(self):
+        self._stats(self.current)["xpath"] += 1
+
+    def record_event(self, event: str, details: dict):
+        builder = self.current
+        self.events[(builder, event)] += 1
+        self.event_details.append({"builder": builder, "event": event, **details})
+
+    def to_dict(self) -> dict:
+        events = {}
+        for (builder, event), count in sorted(self.events.items()):
+            events.setdefault(builder, {})[event] = count
+        return {
+            "builders": {k: dict(v) for k, v in sorted(self.builders.items())},
+            "events": events,
+        }
+
+    def to_json(self, path: Union[str, os.PathLike]):
+        _write_atomic(path, json.dumps(self.to_dict(), indent=2))
+
+    def to_prometheus(self, path: Union[str, os.PathLike], prefix="acdh_cidoc_pyutils"):
+        """writes the statistics in the Prometheus text exposition format, e.g. for node_exporter's textfile collector"""  # noqa: E501
+        metrics = [
+            ("calls", "builder_calls_total", "Number of builder calls"),
+            (
+                "seconds",
+                "builder_seconds_total",
+                "Cumulative wall time of builder calls",
+            ),
+            ("triples", "builder_triples_total", "Number of emitted triples"),
+            ("xpath", "builder_xpath_evaluations_total", "Number of XPath evaluations"),
+        ]
+        lines = []
+        for key, name, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for builder, stats in sorted(self.builders.items()):
+                lines.append(f'{prefix}_{name}{{builder="{builder}"}} {stats[key]}')
+        name = f"{prefix}_diagnostic_events_total"
+        lines.append(f"# HELP {name} Number of diagnostic events")
+        lines.append(f"# TYPE {name} counter")
+        for (builder, event), count in sorted(self.events.items()):
+            lines.append(f'{name}{{builder="{builder}",event="{event}"}} {count}')
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _write_atomic(path: Union[str, os.PathLike], content: str):
+    tmp_path = f"{os.fspath(path)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def active_collector() -> Union[Collector, None]:
+    """returns the collector of the innermost active `with Collector():` block or None"""
+    return _active
+
+
+def instrumented(func):
+    """decorator recording calls, time, triples and XPath evaluations of a builder in the active Collector"""  # noqa: E501
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = _active
+        if collector is None:
+            return func(*args, **kwargs)
+        return collector.call(name, func, args, kwargs)
+
+    return wrapper
+
+
+def diagnostic(event: str, verbose=False, **details):
+    """reports a diagnostic event (e.g. "relation_type_not_found") of a builder
+
+    The event is counted by the active Collector; with `verbose` it is also logged as a warning to the
+    "acdh_cidoc_pyutils" logger.
+    """  # noqa: E501
+    collector = _active
+    if collector is not None:
+        collector.record_event(event, details)
+    if verbose:
+        logger.warning("%s: %s", event, details)
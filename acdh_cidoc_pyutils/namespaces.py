@@ -10,6 +10,62 @@ SCHEMA = Namespace("https://schema.org/")
 SARI = Namespace("http://w3id.org/sari#")
 GEO = Namespace("http://www.opengis.net/ont/geosparql#")
 
+
+class Vocabulary(dict):
+    """Pre-built, shared URIRefs for the terms of a namespace emitted by this package.
+
+    Looking up a term is a plain dict lookup returning always the same URIRef object;
+    unknown terms (e.g. typos) raise a KeyError instead of silently minting a new URI.
+    """
+
+    def __init__(self, namespace: Namespace, terms: list):
+        super().__init__((x, namespace[x]) for x in terms)
+        self.namespace = namespace
+
+    def __missing__(self, key):
+        raise KeyError(f"'{key}' is not a known term of <{self.namespace}>")
+
+
+CIDOC_TERMS = Vocabulary(
+    CIDOC,
+    [
+        "E33_E41_Linguistic_Appellation",
+        "E42_Identifier",
+        "E52_Time-Span",
+        "E55_Type",
+        "E66_Formation",
+        "E67_Birth",
+        "E68_Dissolution",
+        "E69_Death",
+        "E74_Group",
+        "E85_Joining",
+        "E86_Leaving",
+        "P01_has_domain",
+        "P02_has_range",
+        "P100_was_death_of",
+        "P143_joined",
+        "P144_joined_with",
+        "P145_separated",
+        "P146_separated_from",
+        "P14i_performed",
+        "P168_place_is_defined_by",
+        "P1_is_identified_by",
+        "P2_has_type",
+        "P4_has_time-span",
+        "P67_refers_to",
+        "P7_took_place_at",
+        "P82a_begin_of_the_begin",
+        "P82b_end_of_the_end",
+        "P89_falls_within",
+        "P95i_was_formed_by",
+        "P98_brought_into_life",
+    ],
+)
+FRBROO_TERMS = Vocabulary(FRBROO, ["F51_Pursuit"])
+SARI_FRBROO_TERMS = Vocabulary(SARI_FRBROO, ["F24_Publication_Expression"])
+SARI_TERMS = Vocabulary(SARI, ["SRP3_relation_type", "SRPC3_in_social_relation"])
+GEO_TERMS = Vocabulary(GEO, ["wktLiteral"])
+
 NSMAP = {
     "tei": "http://www.tei-c.org/ns/1.0",
     "xml": "http://www.w3.org/XML/1998/namespace",
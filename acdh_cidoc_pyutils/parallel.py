@@ -0,0 +1,266 @@
+import glob
+import io
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import IO, Callable, Iterable, Iterator, Union
+
+import lxml.etree as ET
+from lxml.etree import Element
+from rdflib import URIRef
+
+from acdh_cidoc_pyutils import teidoc_as_f24_publication_expression
+from acdh_cidoc_pyutils.readers import entity_tags_of, iter_register_entities
+from acdh_cidoc_pyutils.utils import cached_xpath
+from acdh_cidoc_pyutils.writers import NTriplesWriter
+
+ENTITY_XPATH = ".//tei:person|.//tei:place|.//tei:org|.//tei:bibl"
+
+
+def entity_subject(node: Element, domain: str, lower_ids=False) -> URIRef:
+    """builds the subject URI of a tei:person|place|org|bibl from its @xml:id
+
+    Args:
+        node (Element): The entity element
+        domain (str): The domain the @xml:id is appended to, e.g. "https://foo/bar/"
+        lower_ids (bool, optional): Lowercase the @xml:id. Defaults to False.
+
+    Returns:
+        URIRef: e.g. <https://foo/bar/DWplace00092>
+    """
+    xml_id = node.attrib["{http://www.w3.org/XML/1998/namespace}id"]
+    if lower_ids:
+        xml_id = xml_id.lower()
+    return URIRef(f"{domain}{xml_id}")
+
+
+def _iter_entities(
+    elements_or_file: Union[str, os.PathLike, Element, Iterable[Element]],
+    entity_xpath: str,
+    huge_tree=False,
+) -> Iterator[Element]:
+    if isinstance(elements_or_file, (str, os.PathLike)):
+        tags = entity_tags_of(entity_xpath)
+        if tags is not None:
+            yield from iter_register_entities(
+                elements_or_file, tags=tags, huge_tree=huge_tree
+            )
+            return
+        parser = ET.XMLParser(huge_tree=huge_tree)
+        doc = ET.parse(os.fspath(elements_or_file), parser)
+        yield from cached_xpath(doc.getroot(), entity_xpath)
+    elif isinstance(elements_or_file, ET._Element):
+        yield from cached_xpath(elements_or_file, entity_xpath)
+    else:
+        yield from elements_or_file
+
+
+def convert_chunk(
+    chunk: list,
+    handlers: list,
+    domain: str,
+    lower_ids=False,
+    graph_name: Union[URIRef, None] = None,
+) -> tuple[bytes, int]:
+    """runs all handlers over a chunk of serialized entity elements and returns N-Triples
+
+    This is what the worker processes of `convert_entities` execute; it is exposed to run or debug a
+    single chunk in-process.
+
+    Args:
+        chunk (list): A list of entities, each serialized as XML bytes
+        handlers (list): Callables called as `handler(subj, node, sink=sink)`, e.g. `make_appellations`
+        domain (str): The domain used to build the entity URIs
+        lower_ids (bool, optional): Lowercase the @xml:id in the entity URIs. Defaults to False.
+        graph_name (Union[URIRef, None], optional): Writes N-Quads lines with this graph name instead of
+            N-Triples. Defaults to None.
+
+    Returns:
+        tuple[bytes, int]: The N-Triples lines and their number
+    """  # noqa: E501
+    stream = io.BytesIO()
+    writer = NTriplesWriter(
+        stream,
+        format="nt" if graph_name is None else "nq",
+        graph_name=graph_name,
+        buffer_size=1 << 22,
+    )
+    for data in chunk:
+        node = ET.fromstring(data)
+        subj = entity_subject(node, domain, lower_ids=lower_ids)
+        for handler in handlers:
+            handler(subj, node, sink=writer)
+    writer.close()
+    return stream.getvalue(), writer.count
+
+
+def _chunks(elements: Iterator[Element], chunk_size: int) -> Iterator[list]:
+    while True:
+        chunk = [ET.tostring(x, with_tail=False) for x in islice(elements, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_entities(
+    elements_or_file: Union[str, os.PathLike, Element, Iterable[Element]],
+    handlers: list[Callable],
+    domain: str,
+    workers: Union[int, None] = None,
+    chunk_size=500,
+    entity_xpath=ENTITY_XPATH,
+    lower_ids=False,
+    huge_tree=False,
+    graph_name: Union[URIRef, None] = None,
+) -> Iterator[bytes]:
+    """converts all entities of a tei:listPerson|listPlace|listOrg in a pool of worker processes
+
+    Files are read with `iter_register_entities` if `entity_xpath` is a union of ".//tei:name" steps,
+    so the register is never loaded as a whole. The entities are split into chunks of `chunk_size`
+    elements which are sent to the workers as XML; the workers send back N-Triples bytes (pickling
+    rdflib graphs is slow). The chunks are yielded in input order, while at most `2 * workers` chunks
+    are in flight at any time.
+
+    Args:
+        elements_or_file (Union[str, os.PathLike, Element, Iterable[Element]]): A path to a TEI file, an
+            element containing the entities (e.g. a tei:listPerson) or an iterable of entity elements.
+        handlers (list[Callable]): Callables called as `handler(subj, node, sink=sink)` for every entity.
+            All builders can be used directly or wrapped in functools.partial, e.g.
+            `partial(make_birth_death_entities, domain="https://foo/bar/")`. Handlers need to be
+            picklable, so use module level functions instead of lambdas.
+        domain (str): The domain used to build the entity URIs: {domain}{@xml:id}
+        workers (Union[int, None], optional): Number of worker processes; 1 converts in-process.
+            Defaults to None (os.cpu_count()).
+        chunk_size (int, optional): Number of entities per chunk. Defaults to 500.
+        entity_xpath (str, optional): XPath selecting the entities. Defaults to ENTITY_XPATH.
+        lower_ids (bool, optional): Lowercase the @xml:id in the entity URIs. Defaults to False.
+        huge_tree (bool, optional): Lifts lxml's limits on text node size and tree depth when reading
+            a file. Defaults to False.
+        graph_name (Union[URIRef, None], optional): Produces N-Quads lines with this graph name instead
+            of N-Triples. Defaults to None.
+
+    Yields:
+        bytes: N-Triples lines of one chunk, e.g. to be passed to `NTriplesWriter.write_raw`
+    """  # noqa: E501
+    elements = _iter_entities(elements_or_file, entity_xpath, huge_tree=huge_tree)
+    chunks = _chunks(iter(elements), chunk_size)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for chunk in chunks:
+            yield convert_chunk(chunk, handlers, domain, lower_ids, graph_name)[0]
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(
+                executor.submit(
+                    convert_chunk, chunk, handlers, domain, lower_ids, graph_name
+                )
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()[0]
+        while pending:
+            yield pending.popleft().result()[0]
+
+
+def _corpus_paths(paths_or_glob: Union[str, os.PathLike, Iterable[str]]) -> list[str]:
+    if isinstance(paths_or_glob, (str, os.PathLike)):
+        pattern = os.fspath(paths_or_glob)
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.xml")
+        return glob.glob(pattern, recursive=True)
+    return [os.fspath(x) for x in paths_or_glob]
+
+
+def convert_f24_file(path: str, domain: str, kwargs: dict) -> tuple:
+    """converts a single TEI file with `teidoc_as_f24_publication_expression` into N-Triples
+
+    This is what the worker processes of `corpus_as_f24` execute. Exceptions are caught and returned,
+    nothing of a failing file ends up in the output.
+
+    Returns:
+        tuple: (path, N-Triples bytes, number of lines, mentions or None, error message or None)
+    """  # noqa: E501
+    stream = io.BytesIO()
+    writer = NTriplesWriter(stream, buffer_size=1 << 22)
+    try:
+        _, _, mentions = teidoc_as_f24_publication_expression(
+            path, domain, sink=writer, **kwargs
+        )
+        writer.close()
+    except Exception as e:
+        return path, b"", 0, None, f"{type(e).__name__}: {e}"
+    return path, stream.getvalue(), writer.count, mentions, None
+
+
+def corpus_as_f24(
+    paths_or_glob: Union[str, os.PathLike, Iterable[str]],
+    domain: str,
+    output: Union[str, os.PathLike, IO[bytes], NTriplesWriter],
+    workers: Union[int, None] = None,
+    **kwargs,
+) -> tuple[dict, dict]:
+    """converts a corpus of TEI files into F24_Publication_Expressions in a pool of worker processes
+
+    The files are scheduled largest first, so big files do not end up as stragglers at the end of the
+    run, and the N-Triples of every finished file are streamed into `output` as soon as they arrive
+    (so the order of the documents in the output is not stable). A file that fails to convert is
+    recorded in the returned failures and does not abort the run.
+
+    Args:
+        paths_or_glob (Union[str, os.PathLike, Iterable[str]]): A directory (all *.xml files in it),
+            a glob pattern like "data/editions/**/*.xml" or an iterable of file paths.
+        domain (str): Base URI domain for the generated RDF resources.
+        output (Union[str, os.PathLike, IO[bytes], NTriplesWriter]): A file path or binary stream passed to
+            NTriplesWriter (compression is taken from a ".gz"/".zst" suffix), or an open NTriplesWriter.
+        workers (Union[int, None], optional): Number of worker processes; 1 converts in-process.
+            Defaults to None (os.cpu_count()).
+        **kwargs: Passed on to `teidoc_as_f24_publication_expression`, e.g. `title_xpath` or `streaming=True`.
+
+    Returns:
+        tuple[dict, dict]: The mentions per file path and the error message per failed file path.
+    """  # noqa: E501
+    mentions, failures = {}, {}
+    sizes = {}
+    for path in _corpus_paths(paths_or_glob):
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError as e:
+            failures[path] = f"{type(e).__name__}: {e}"
+    paths = sorted(sizes, key=sizes.get, reverse=True)
+    if isinstance(output, NTriplesWriter):
+        writer = output
+    else:
+        writer = NTriplesWriter(output)
+
+    def collect(result):
+        path, data, count, doc_mentions, error = result
+        if error is None:
+            writer.write_raw(data, count)
+            mentions[path] = doc_mentions
+        else:
+            failures[path] = error
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    try:
+        if workers <= 1:
+            for path in paths:
+                collect(convert_f24_file(path, domain, kwargs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = set()
+                for path in paths:
+                    pending.add(executor.submit(convert_f24_file, path, domain, kwargs))
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                for future in wait(pending).done:
+                    collect(future.result())
+    finally:
+        if writer is not output:
+            writer.close()
+    return mentions, failures
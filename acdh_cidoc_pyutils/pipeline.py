@@ -0,0 +1,306 @@
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import IO, Callable, Iterable, Union
+
+import lxml.etree as ET
+
+from acdh_cidoc_pyutils import teidoc_as_f24_publication_expression
+from acdh_cidoc_pyutils.parallel import ENTITY_XPATH, _corpus_paths, entity_subject
+from acdh_cidoc_pyutils.utils import cached_xpath
+from acdh_cidoc_pyutils.writers import NTriplesWriter
+
+STAGES = ["read", "convert", "write"]
+
+
+class PipelineMetrics:
+    """Throughput and queue depth of a running or finished pipeline.
+
+    The counters are updated by the pipeline's stages while it runs, so another asyncio task can poll
+    `to_dict()` for progress. `seconds` holds the time each stage spent waiting for its work to be
+    done (reading, converting in the executor, writing), summed over all workers of a stage.
+    """  # noqa: E501
+
+    def __init__(self):
+        self.started = None
+        self.finished = None
+        self.files_read = 0
+        self.bytes_read = 0
+        self.files_converted = 0
+        self.files_failed = 0
+        self.triples = 0
+        self.bytes_written = 0
+        self.seconds = {x: 0.0 for x in STAGES}
+        self.max_depth = {}
+        self._queues = {}
+
+    def _watch(self, name: str, queue: asyncio.Queue):
+        self._queues[name] = queue
+        self.max_depth[name] = 0
+
+    def _observe(self, name: str):
+        depth = self._queues[name].qsize()
+        if depth > self.max_depth[name]:
+            self.max_depth[name] = depth
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        end = time.perf_counter() if self.finished is None else self.finished
+        return end - self.started
+
+    def to_dict(self) -> dict:
+        elapsed = self.elapsed or float("nan")
+        return {
+            "elapsed": round(self.elapsed, 4),
+            "files_read": self.files_read,
+            "bytes_read": self.bytes_read,
+            "files_converted": self.files_converted,
+            "files_failed": self.files_failed,
+            "triples": self.triples,
+            "bytes_written": self.bytes_written,
+            "files_per_second": round(self.files_converted / elapsed, 2),
+            "triples_per_second": round(self.triples / elapsed, 2),
+            "stage_seconds": {k: round(v, 4) for k, v in self.seconds.items()},
+            "queues": {
+                name: {
+                    "depth": queue.qsize(),
+                    "max_depth": self.max_depth[name],
+                    "size": queue.maxsize,
+                }
+                for name, queue in self._queues.items()
+            },
+        }
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def convert_f24_data(path: str, data: bytes, domain: str, kwargs: dict) -> tuple:
+    """converts the content of a TEI file with `teidoc_as_f24_publication_expression`
+
+    Returns:
+        tuple: (N-Triples bytes, number of lines, mentions)
+    """
+    stream = io.BytesIO()
+    writer = NTriplesWriter(stream, buffer_size=1 << 22)
+    _, _, mentions = teidoc_as_f24_publication_expression(
+        path, domain, data=data, sink=writer, **kwargs
+    )
+    writer.close()
+    return stream.getvalue(), writer.count, mentions
+
+
+def convert_register_data(
+    path: str,
+    data: bytes,
+    handlers: list,
+    domain: str,
+    entity_xpath=ENTITY_XPATH,
+    lower_ids=False,
+) -> tuple:
+    """runs all handlers over the entities of a register file's content
+
+    Returns:
+        tuple: (N-Triples bytes, number of lines, number of entities)
+    """
+    stream = io.BytesIO()
+    writer = NTriplesWriter(stream, buffer_size=1 << 22)
+    entities = cached_xpath(ET.fromstring(data), entity_xpath)
+    for node in entities:
+        subj = entity_subject(node, domain, lower_ids=lower_ids)
+        for handler in handlers:
+            handler(subj, node, sink=writer)
+    writer.close()
+    return stream.getvalue(), writer.count, len(entities)
+
+
+def f24_converter(domain: str, **kwargs) -> Callable:
+    """returns a picklable converter for `convert_files` creating F24_Publication_Expressions
+
+    Args:
+        domain (str): Base URI domain for the generated RDF resources.
+        **kwargs: Passed on to `teidoc_as_f24_publication_expression`, e.g. `title_xpath`.
+    """
+    return partial(convert_f24_data, domain=domain, kwargs=kwargs)
+
+
+def register_converter(
+    handlers: list[Callable], domain: str, entity_xpath=ENTITY_XPATH, lower_ids=False
+) -> Callable:
+    """returns a picklable converter for `convert_files` running builders over register files
+
+    Args:
+        handlers (list[Callable]): Called as `handler(subj, node, sink=sink)` for every entity, see
+            `convert_entities`.
+        domain (str): The domain used to build the entity URIs: {domain}{@xml:id}
+        entity_xpath (str, optional): XPath selecting the entities. Defaults to ENTITY_XPATH.
+        lower_ids (bool, optional): Lowercase the @xml:id in the entity URIs. Defaults to False.
+    """  # noqa: E501
+    return partial(
+        convert_register_data,
+        handlers=handlers,
+        domain=domain,
+        entity_xpath=entity_xpath,
+        lower_ids=lower_ids,
+    )
+
+
+async def _cancel_on_error(tasks: list):
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def convert_files_async(
+    paths_or_glob: Union[str, os.PathLike, Iterable[str]],
+    convert: Callable,
+    output: Union[str, os.PathLike, IO[bytes], NTriplesWriter],
+    executor: Union[str, Executor] = "process",
+    workers: Union[int, None] = None,
+    queue_size: Union[int, None] = None,
+    metrics: Union[PipelineMetrics, None] = None,
+) -> tuple[dict, dict, PipelineMetrics]:
+    """converts files in an asyncio pipeline of read, convert and write stages
+
+    A reader task reads the files (in a thread, in input order), `workers` converter tasks hand their
+    content to `executor` and a writer task streams the N-Triples into `output` (in a separate
+    thread). The stages are connected by queues of `queue_size` items, so a slow stage blocks the
+    ones before it instead of piling up file contents or results in memory.
+
+    Args:
+        paths_or_glob (Union[str, os.PathLike, Iterable[str]]): A directory (all *.xml files in it),
+            a glob pattern like "data/editions/**/*.xml" or an iterable of file paths.
+        convert (Callable): Called as `convert(path, data)` in the executor, returns a tuple of
+            N-Triples bytes, their number of lines and a (picklable) result, e.g. `f24_converter(domain)`
+            or `register_converter(handlers, domain)`.
+        output (Union[str, os.PathLike, IO[bytes], NTriplesWriter]): A file path or binary stream passed to
+            NTriplesWriter (compression is taken from a ".gz"/".zst" suffix), or an open NTriplesWriter.
+        executor (Union[str, Executor], optional): "process", "thread" or an Executor to run `convert`
+            in. The builders hold the GIL most of the time, so threads mainly help when conversion
+            waits for I/O. Defaults to "process".
+        workers (Union[int, None], optional): Number of concurrent conversions (and of workers of a
+            created executor). Defaults to None (os.cpu_count()).
+        queue_size (Union[int, None], optional): Maximum number of items in each queue. Defaults to
+            None (2 * workers).
+        metrics (Union[PipelineMetrics, None], optional): A PipelineMetrics to update, e.g. to poll it
+            from another task. Defaults to None (a new one).
+
+    Returns:
+        tuple[dict, dict, PipelineMetrics]: The result of `convert` per file path, the error message
+            per failed file path and the metrics.
+    """  # noqa: E501
+    paths = _corpus_paths(paths_or_glob)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if queue_size is None:
+        queue_size = 2 * workers
+    metrics = PipelineMetrics() if metrics is None else metrics
+    results, failures = {}, {}
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, Executor):
+        pool = executor
+    elif executor == "process":
+        pool = ProcessPoolExecutor(max_workers=workers)
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers)
+    else:
+        raise ValueError(f"unsupported executor: {executor}, use 'process' or 'thread'")
+    io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline-io")
+    if isinstance(output, NTriplesWriter):
+        writer = output
+    else:
+        writer = NTriplesWriter(output)
+    read_queue = asyncio.Queue(maxsize=queue_size)
+    write_queue = asyncio.Queue(maxsize=queue_size)
+    metrics._watch("read", read_queue)
+    metrics._watch("write", write_queue)
+
+    async def read():
+        for path in paths:
+            start = time.perf_counter()
+            try:
+                data = await loop.run_in_executor(io_pool, _read_file, path)
+            except OSError as e:
+                failures[path] = f"{type(e).__name__}: {e}"
+                metrics.files_failed += 1
+                continue
+            finally:
+                metrics.seconds["read"] += time.perf_counter() - start
+            metrics.files_read += 1
+            metrics.bytes_read += len(data)
+            await read_queue.put((path, data))
+            metrics._observe("read")
+        for _ in range(workers):
+            await read_queue.put(None)
+
+    async def convert_items():
+        while True:
+            item = await read_queue.get()
+            if item is None:
+                return
+            path, data = item
+            start = time.perf_counter()
+            try:
+                converted = await loop.run_in_executor(pool, convert, path, data)
+            except Exception as e:
+                failures[path] = f"{type(e).__name__}: {e}"
+                metrics.files_failed += 1
+                continue
+            finally:
+                metrics.seconds["convert"] += time.perf_counter() - start
+            await write_queue.put((path, converted))
+            metrics._observe("write")
+
+    async def convert_all():
+        await _cancel_on_error(
+            [asyncio.ensure_future(convert_items()) for _ in range(workers)]
+        )
+        await write_queue.put(None)
+
+    async def write():
+        while True:
+            item = await write_queue.get()
+            if item is None:
+                return
+            path, (data, count, result) = item
+            start = time.perf_counter()
+            await loop.run_in_executor(io_pool, writer.write_raw, data, count)
+            metrics.seconds["write"] += time.perf_counter() - start
+            metrics.files_converted += 1
+            metrics.triples += count
+            metrics.bytes_written += len(data)
+            results[path] = result
+
+    metrics.started = time.perf_counter()
+    try:
+        await _cancel_on_error(
+            [
+                asyncio.ensure_future(read()),
+                asyncio.ensure_future(convert_all()),
+                asyncio.ensure_future(write()),
+            ]
+        )
+    finally:
+        if writer is not output:
+            await loop.run_in_executor(io_pool, writer.close)
+        io_pool.shutdown()
+        if pool is not executor:
+            pool.shutdown()
+        metrics.finished = time.perf_counter()
+    return results, failures, metrics
+
+
+def convert_files(*args, **kwargs) -> tuple[dict, dict, PipelineMetrics]:
+    """runs `convert_files_async` in a new event loop, takes and returns the same arguments and values"""  # noqa: E501
+    return asyncio.run(convert_files_async(*args, **kwargs))
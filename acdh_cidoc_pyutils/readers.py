@@ -0,0 +1,72 @@
+import os
+import re
+from typing import IO, Iterable, Iterator, Union
+
+import lxml.etree as ET
+from lxml.etree import Element
+
+from acdh_cidoc_pyutils.namespaces import NSMAP
+
+ENTITY_TAGS = ("person", "place", "org", "bibl")
+
+
+def entity_tags_of(entity_xpath: str) -> Union[list[str], None]:
+    """returns the local names of an XPath like ".//tei:person|.//tei:place" or None if it is anything else"""  # noqa: E501
+    parts = [x.strip() for x in entity_xpath.split("|")]
+    tags = []
+    for part in parts:
+        match = re.fullmatch(r"\.//tei:([\w.-]+)", part)
+        if match is None:
+            return None
+        tags.append(match.group(1))
+    return tags
+
+
+def iter_register_entities(
+    source: Union[str, os.PathLike, IO[bytes]],
+    tags: Iterable[str] = ENTITY_TAGS,
+    huge_tree=False,
+    nested=True,
+) -> Iterator[Element]:
+    """yields the tei:person|place|org|bibl elements of a TEI register file without loading the whole document
+
+    The file is read with lxml's iterparse. Every complete entity is yielded and, once the consumer asks
+    for the next one, cleared together with its preceding siblings, so peak memory is bounded by the
+    largest entity instead of the size of the file. Elements are only valid until the next one is
+    requested: convert or copy them before that.
+
+    Entities nested in other entities (e.g. a tei:bibl inside a tei:person) are kept in their parent and,
+    with `nested`, yielded right after it, which is the document order of `.//tei:person|.//tei:place|...`.
+
+    Args:
+        source (Union[str, os.PathLike, IO[bytes]]): A file path or binary file object.
+        tags (Iterable[str], optional): Local names of the TEI entity elements. Defaults to ENTITY_TAGS.
+        huge_tree (bool, optional): Passed to lxml to lift its limits on text node size and tree depth,
+            e.g. for entities with very long notes. Defaults to False.
+        nested (bool, optional): Also yields entities nested in other entities. Defaults to True.
+
+    Yields:
+        Element: The entity elements in document order
+    """  # noqa: E501
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    entity_tags = [f"{{{NSMAP['tei']}}}{x}" for x in tags]
+    depth = 0
+    for event, elem in ET.iterparse(
+        source, events=("start", "end"), tag=entity_tags, huge_tree=huge_tree
+    ):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth:
+            # nested entity, cleared with the outermost one
+            continue
+        yield elem
+        if nested:
+            yield from elem.iterdescendants(entity_tags)
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
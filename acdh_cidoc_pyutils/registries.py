@@ -0,0 +1,206 @@
+import hashlib
+import os
+from typing import Union
+from urllib.parse import quote
+
+import lxml.etree as ET
+from acdh_tei_pyutils.utils import make_entity_label
+from rdflib import URIRef
+from slugify import slugify
+
+from acdh_cidoc_pyutils.namespaces import NSMAP
+from acdh_cidoc_pyutils.utils import cached_xpath, remove_trailing_slash
+
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
+
+class TimeSpanRegistry:
+    """Maps (begin, end, type_uri) to one canonical E52_Time-Span URI per run.
+
+    Pass the same registry (and the same sink) to the builders via `time_spans=` and every distinct
+    time-span is emitted only once, events link to the shared node. The URIs are derived from the
+    dates only, e.g. `https://foo/bar/time-span/1870_1870`, so they are stable across runs and
+    across worker processes.
+
+    Args:
+        domain (str, optional): The domain of the time-span URIs. Defaults to "https://foo-bar/".
+        prefix (str, optional): Path segment between domain and dates. Defaults to "time-span".
+    """  # noqa: E501
+
+    def __init__(self, domain="https://foo-bar/", prefix="time-span"):
+        self.base_uri = f"{remove_trailing_slash(domain)}/{prefix}/"
+        self._uris = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._uris)
+
+    def __contains__(self, key: tuple):
+        return key in self._uris
+
+    def make_uri(
+        self,
+        begin: Union[str, None],
+        end: Union[str, None],
+        type_uri: Union[URIRef, None] = None,
+    ) -> URIRef:
+        """derives the deterministic URI of a time-span without registering it"""
+        name = "_".join(
+            "undefined" if x is None else quote(x, safe="-") for x in (begin, end)
+        )
+        if type_uri:
+            name = f"{name}/{hashlib.sha1(type_uri.encode('utf-8')).hexdigest()[:10]}"
+        return URIRef(f"{self.base_uri}{name}")
+
+    def resolve(
+        self,
+        begin: Union[str, None],
+        end: Union[str, None],
+        type_uri: Union[URIRef, None] = None,
+    ) -> tuple[URIRef, bool]:
+        """returns the canonical URI of a time-span and whether it was seen for the first time
+
+        Returns:
+            tuple[URIRef, bool]: The URI and True if the E52 triples still need to be emitted
+        """
+        key = (begin, end, type_uri)
+        try:
+            uri = self._uris[key]
+        except KeyError:
+            uri = self.make_uri(begin, end, type_uri)
+            self._uris[key] = uri
+            return uri, True
+        self.hits += 1
+        return uri, False
+
+
+class OrgRegistry:
+    """Maps the ids of organisations to their URI and preferred label.
+
+    Build it once from a tei:listOrg and pass it to `make_affiliations` via `org_registry=`: the
+    labels of joining/leaving events and org objects are looked up in the registry instead of being
+    taken from every tei:affiliation's text, and with `add_org_object=True` each organisation's
+    E74_Group triples are emitted only once per registry. Ids missing from the listOrg are
+    registered with the label of their first affiliation.
+
+    Args:
+        domain (str, optional): The domain of the organisation URIs, should match the domain passed to
+            `make_affiliations`. Defaults to "https://foo-bar/".
+        pref_type (str, optional): @type of the tei:orgName preferred as label, otherwise the first
+            tei:orgName is used. Defaults to "pref".
+    """  # noqa: E501
+
+    def __init__(self, domain="https://foo-bar/", pref_type="pref"):
+        self.domain = domain
+        self.pref_type = pref_type
+        self._orgs = {}
+        self._emitted = set()
+
+    def __len__(self):
+        return len(self._orgs)
+
+    def __contains__(self, org_id: str):
+        return org_id in self._orgs
+
+    def add(self, org_id: str, label: str) -> URIRef:
+        """registers (or relabels) an organisation and returns its URI"""
+        uri = URIRef(f"{self.domain}{org_id}")
+        self._orgs[org_id] = (uri, label)
+        return uri
+
+    def _add_org(self, node: ET._Element):
+        org_id = node.get(XML_ID)
+        if not org_id:
+            return
+        names = cached_xpath(node, "./tei:orgName")
+        if not names:
+            return
+        preferred = [x for x in names if x.get("type") == self.pref_type]
+        label, _ = make_entity_label((preferred or names)[0])
+        self.add(org_id, label)
+
+    def load(self, list_org: Union[str, os.PathLike, ET._Element]) -> "OrgRegistry":
+        """registers all tei:org elements with an @xml:id of a TEI file (read with iterparse) or element
+
+        Returns:
+            OrgRegistry: The registry itself
+        """  # noqa: E501
+        if isinstance(list_org, ET._Element):
+            for node in cached_xpath(list_org, "descendant-or-self::tei:org"):
+                self._add_org(node)
+            return self
+        org_tag = f"{{{NSMAP['tei']}}}org"
+        for _, elem in ET.iterparse(os.fspath(list_org), tag=org_tag):
+            self._add_org(elem)
+            parent = elem.getparent()
+            # nested orgs are cleared together with their parent
+            if parent is not None and parent.tag != org_tag:
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del parent[0]
+        return self
+
+    def resolve(
+        self, org_id: str, label: Union[str, None] = None, emit=True
+    ) -> tuple[URIRef, str, bool]:
+        """returns the URI and preferred label of an organisation and whether its E74_Group triples are still to be emitted
+
+        Args:
+            org_id (str): The id of the organisation (without a leading '#').
+            label (Union[str, None], optional): The label used (and registered) if the id is not known yet.
+                Defaults to None.
+            emit (bool, optional): Whether the caller emits the E74_Group triples if they are due; only then
+                the organisation is marked as emitted. Defaults to True.
+
+        Returns:
+            tuple[URIRef, str, bool]: The URI, the label and True the first time an id is resolved with `emit`
+        """  # noqa: E501
+        try:
+            uri, label = self._orgs[org_id]
+        except KeyError:
+            uri = self.add(org_id, label)
+        if not emit or org_id in self._emitted:
+            return uri, label, False
+        self._emitted.add(org_id)
+        return uri, label, True
+
+
+class TypeRegistry:
+    """Remembers which E55_Type URIs were already emitted in a run.
+
+    Pass the same registry (and the same sink) to `make_appellations`, `make_e42_identifiers` and
+    `teidoc_as_f24_publication_expression` via `type_registry=` and the `rdf:type` and `rdfs:label`
+    triples of every type (e.g. `idno/xml-id` "Identifier: XML-ID") are emitted only the first time
+    the type is used instead of once per appellation or identifier. If two different labels map to
+    the same type URI, only the first one is emitted. Type URIs derived from slugified labels are
+    cached.
+    """  # noqa: E501
+
+    def __init__(self):
+        self._seen = set()
+        self._uris = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, type_uri: URIRef):
+        return type_uri in self._seen
+
+    def make_uri(self, base_uri: str, label: str) -> URIRef:
+        """returns the (cached) URI `{base_uri}/{slugify(label)}` in lower case"""
+        key = (base_uri, label)
+        try:
+            return self._uris[key]
+        except KeyError:
+            uri = URIRef(f"{base_uri}/{slugify(label)}".lower())
+            self._uris[key] = uri
+            return uri
+
+    def register(self, type_uri: URIRef) -> bool:
+        """returns True if the type is seen for the first time, i.e. its triples still need to be emitted"""  # noqa: E501
+        if type_uri in self._seen:
+            self.hits += 1
+            return False
+        self._seen.add(type_uri)
+        return True
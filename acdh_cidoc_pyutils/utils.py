@@ -1,5 +1,148 @@
+import re
+from functools import lru_cache
+from typing import Iterable
+
+from lxml import etree
+from AcdhArcheAssets.uri_norm_rules import get_rules
+
+from acdh_cidoc_pyutils import instrumentation
+from acdh_cidoc_pyutils.namespaces import NSMAP
+
+XPATH_CACHE_SIZE = 1024
+URI_CACHE_SIZE = 65536
+
+
 def remove_trailing_slash(url: str) -> str:
     """Remove trailing slash from a URL."""
     if url[-1] == "/":
         return url[:-1]
     return url
+
+
+def element_text(node, separator=" ") -> str:
+    """Return the whitespace-normalized text content of an element and its descendants.
+
+    Equivalent to `normalize_string(" ".join(node.xpath(".//text()")))` but without building an XPath
+    result list; comments and processing instructions are skipped.
+
+    Args:
+        node (Element): The element, e.g. a tei:occupation with mixed content.
+        separator (str, optional): Put between the text nodes before whitespace is collapsed; "" joins
+            e.g. "<hi>Brief</hi>e" to "Briefe" like `extract_fulltext`. Defaults to " ".
+
+    Returns:
+        str: The text with all runs of whitespace collapsed into single blanks.
+    """  # noqa: E501
+    return " ".join(separator.join(node.itertext()).split())
+
+
+def drain_into(triples, sink):
+    """Add all triples yielded by a generator to a sink and return the generator's return value.
+
+    Args:
+        triples (Generator): A generator yielding (s, p, o) tuples, e.g. one of the iter_* functions.
+        sink (Graph): A Graph or any object with an `add(triple)` method.
+
+    Returns:
+        The value returned by the generator (None for most iter_* functions).
+    """
+    add = sink.add
+    collector = instrumentation._active
+    if collector is not None:
+        sink_add = add
+
+        def add(triple):
+            collector.count_triple()
+            sink_add(triple)
+
+    try:
+        while True:
+            add(next(triples))
+    except StopIteration as e:
+        return e.value
+
+
+@lru_cache(maxsize=XPATH_CACHE_SIZE)
+def compile_xpath(expression: str) -> etree.XPath:
+    """Compile an XPath expression against NSMAP once and keep it in a bounded LRU cache.
+
+    Args:
+        expression (str): An XPath expression using the prefixes of NSMAP, e.g. ".//tei:idno".
+
+    Returns:
+        etree.XPath: The compiled expression, callable with an element or element tree.
+    """
+    return etree.XPath(expression, namespaces=NSMAP, smart_strings=False)
+
+
+def cached_xpath(node, expression: str) -> list:
+    """Evaluate an XPath expression on a node using the compiled expression cache.
+
+    Args:
+        node (Element): The context node (or an element tree).
+        expression (str): An XPath expression using the prefixes of NSMAP.
+
+    Returns:
+        list: The XPath result, like node.xpath(expression, namespaces=NSMAP).
+    """
+    if instrumentation._active is not None:
+        instrumentation._active.count_xpath()
+    return compile_xpath(expression)(node)
+
+
+def xpath_cache_info():
+    """Hit/miss statistics of the compiled XPath cache (a functools `CacheInfo` named tuple)."""
+    return compile_xpath.cache_info()
+
+
+@lru_cache(maxsize=1)
+def _uri_norm_rules() -> tuple:
+    return tuple((re.compile(x["match"]), x["replace"]) for x in get_rules())
+
+
+@lru_cache(maxsize=URI_CACHE_SIZE)
+def normalize_uri(uri: str) -> str:
+    """Memoized version of AcdhArcheAssets' `get_normalized_uri`.
+
+    The normalization rules are loaded and compiled once, results are kept in a bounded LRU cache
+    of URI_CACHE_SIZE entries.
+
+    Args:
+        uri (str): A normdata URI, e.g. "http://d-nb.info/gnd/101791799X"
+
+    Returns:
+        str: The normalized URI, e.g. "https://d-nb.info/gnd/101791799X"
+    """  # noqa: E501
+    for pattern, replace in _uri_norm_rules():
+        uri = pattern.sub(replace, uri)
+    return uri
+
+
+def normalize_uris(uris: Iterable[str]) -> list[str]:
+    """Normalizes a whole column of URIs (e.g. all tei:idno values of a register) with `normalize_uri`
+
+    Args:
+        uris (Iterable[str]): The URIs to normalize
+
+    Returns:
+        list[str]: The normalized URIs, in input order
+    """  # noqa: E501
+    return list(map(normalize_uri, uris))
+
+
+def uri_cache_info():
+    """Hit/miss statistics of the URI normalization cache (a functools `CacheInfo` named tuple)."""
+    return normalize_uri.cache_info()
+
+
+@lru_cache(maxsize=64)
+def compile_authority_patterns(patterns: tuple) -> re.Pattern:
+    """Compile a tuple of authority patterns (plain substrings) into a single regex matcher.
+
+    Args:
+        patterns (tuple): Substrings like "d-nb.info" or "geonames"
+
+    Returns:
+        re.Pattern: A pattern whose `search` finds any of the substrings
+    """
+    return re.compile("|".join(re.escape(x) for x in patterns))
@@ -0,0 +1,277 @@
+import gzip
+import os
+from typing import IO, Iterable, Union
+
+from rdflib import BNode, Literal, URIRef
+
+
+def _escape_literal(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def term_to_nt(term: Union[URIRef, Literal, BNode]) -> str:
+    """serializes a single rdflib term the way it is written in N-Triples/N-Quads
+
+    Args:
+        term (Union[URIRef, Literal, BNode]): The term to serialize
+
+    Returns:
+        str: e.g. `<https://foo/bar>`, `"Wien"@de`, `"1900"^^<http://www.w3.org/2001/XMLSchema#gYear>`
+    """
+    if isinstance(term, Literal):
+        value = f'"{_escape_literal(str(term))}"'
+        if term.language:
+            return f"{value}@{term.language}"
+        if term.datatype:
+            return f"{value}^^<{term.datatype}>"
+        return value
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    return f"<{term}>"
+
+
+def triple_to_nt(triple: tuple, graph_name: Union[URIRef, None] = None) -> str:
+    """serializes a (s, p, o) or (s, p, o, g) tuple into one N-Triples/N-Quads line
+
+    Args:
+        triple (tuple): The (s, p, o) tuple; a fourth item is taken as the graph name
+        graph_name (Union[URIRef, None], optional): Graph name for (s, p, o) tuples. Defaults to None.
+
+    Returns:
+        str: The serialized line including the terminating " .\\n"
+    """
+    if len(triple) == 4:
+        s, p, o, graph_name = triple
+    else:
+        s, p, o = triple
+    if graph_name is None:
+        return f"{term_to_nt(s)} {term_to_nt(p)} {term_to_nt(o)} .\n"
+    return (
+        f"{term_to_nt(s)} {term_to_nt(p)} {term_to_nt(o)} {term_to_nt(graph_name)} .\n"
+    )
+
+
+def _open_zstd(stream: IO[bytes], level: int, close_stream: bool) -> IO[bytes]:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package: pip install zstandard"
+        ) from e
+    compressor = zstandard.ZstdCompressor(level=level)
+    return compressor.stream_writer(stream, closefd=close_stream)
+
+
+class NTriplesWriter:
+    """Writes triples incrementally as N-Triples (or N-Quads) lines to a file or stream.
+
+    The writer can be used as a sink for all builders, e.g. `make_appellations(subj, node, sink=writer)`,
+    so nothing is accumulated in memory apart from a write buffer of `buffer_size` bytes.
+
+    Args:
+        destination (Union[str, os.PathLike, IO[bytes]]): A file path or a binary stream.
+        format (str, optional): "nt" for N-Triples or "nq" for N-Quads. Defaults to "nt".
+        compression (Union[str, None], optional): None, "gzip" or "zstd"; if None and destination is a path ending
+            on ".gz" or ".zst" the compression is taken from the file suffix. Defaults to None.
+        buffer_size (int, optional): Number of bytes collected before they are written out. Defaults to 1 MiB.
+        graph_name (Union[URIRef, None], optional): The graph name used for N-Quads lines of (s, p, o) tuples.
+            Defaults to None (the default graph).
+        compression_level (Union[int, None], optional): Compression level handed to gzip/zstd. Defaults to None.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        destination: Union[str, os.PathLike, IO[bytes]],
+        format="nt",
+        compression=None,
+        buffer_size=1 << 20,
+        graph_name: Union[URIRef, None] = None,
+        compression_level: Union[int, None] = None,
+    ):
+        if format not in ("nt", "nq"):
+            raise ValueError(f"unsupported format: {format}, use 'nt' or 'nq'")
+        self.format = format
+        self.graph_name = graph_name if format == "nq" else None
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._buffer = []
+        self._buffered = 0
+        if isinstance(destination, (str, os.PathLike)):
+            path = os.fspath(destination)
+            if compression is None:
+                if path.endswith(".gz"):
+                    compression = "gzip"
+                elif path.endswith(".zst"):
+                    compression = "zstd"
+            raw = open(path, "wb")
+            owns_raw = True
+        else:
+            raw = destination
+            owns_raw = False
+        if compression is None:
+            self._stream = raw
+        elif compression == "gzip":
+            self._stream = gzip.GzipFile(
+                fileobj=raw,
+                mode="wb",
+                compresslevel=9 if compression_level is None else compression_level,
+            )
+        elif compression == "zstd":
+            self._stream = _open_zstd(
+                raw, 3 if compression_level is None else compression_level, owns_raw
+            )
+        else:
+            raise ValueError(
+                f"unsupported compression: {compression}, use 'gzip' or 'zstd'"
+            )
+        self.compression = compression
+        self._raw = raw
+        self._owns_raw = owns_raw
+        self.closed = False
+
+    def add(self, triple: tuple):
+        """adds a single (s, p, o) or (s, p, o, g) tuple"""
+        line = triple_to_nt(triple, self.graph_name).encode("utf-8")
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self.count += 1
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write(self, triples: Iterable[tuple]) -> int:
+        """adds all tuples of an iterable (e.g. a Graph or one of the iter_* generators)
+
+        Returns:
+            int: the number of written lines
+        """
+        before = self.count
+        for triple in triples:
+            self.add(triple)
+        return self.count - before
+
+    def write_raw(self, data: bytes, count: Union[int, None] = None):
+        """writes already serialized N-Triples/N-Quads lines (e.g. produced by worker processes)
+
+        Args:
+            data (bytes): Serialized lines, each terminated by a newline.
+            count (Union[int, None], optional): Number of lines in data, used to keep `count` up to date.
+                Defaults to None (the newlines in data are counted).
+        """  # noqa: E501
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self.count += data.count(b"\n") if count is None else count
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._stream.write(b"".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        if self._stream is not self._raw:
+            self._stream.close()
+        if self._owns_raw:
+            self._raw.close()
+        else:
+            self._raw.flush()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ShardedWriter:
+    """Writes triples into numbered files of about `shard_size` lines each, e.g. `out-00000.nt.gz`.
+
+    Can be used like an NTriplesWriter (as a sink or with `write_raw`); a new shard is started before a
+    line or a raw block is written into a full one, so shards written with `write_raw` may exceed
+    `shard_size` by one block.
+
+    Args:
+        prefix (Union[str, os.PathLike]): Path prefix of the shards, the shard number and suffix are appended.
+        shard_size (int, optional): Number of lines per shard. Defaults to 1_000_000.
+        format (str, optional): "nt" for N-Triples or "nq" for N-Quads. Defaults to "nt".
+        compression (Union[str, None], optional): None, "gzip" or "zstd". Defaults to "gzip".
+        **kwargs: Passed on to the NTriplesWriter of every shard, e.g. `graph_name` or `compression_level`.
+    """  # noqa: E501
+
+    suffixes = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+    def __init__(
+        self,
+        prefix: Union[str, os.PathLike],
+        shard_size=1_000_000,
+        format="nt",
+        compression="gzip",
+        **kwargs,
+    ):
+        if compression not in self.suffixes:
+            raise ValueError(
+                f"unsupported compression: {compression}, use 'gzip' or 'zstd'"
+            )
+        self.prefix = os.fspath(prefix)
+        self.shard_size = shard_size
+        self.format = format
+        self.compression = compression
+        self.kwargs = kwargs
+        self.paths = []
+        self.closed = False
+        self._count = 0
+        self._writer = None
+
+    @property
+    def count(self) -> int:
+        return self._count + (self._writer.count if self._writer else 0)
+
+    def _shard(self) -> NTriplesWriter:
+        if self._writer is not None and self._writer.count < self.shard_size:
+            return self._writer
+        if self._writer is not None:
+            self._count += self._writer.count
+            self._writer.close()
+        path = f"{self.prefix}-{len(self.paths):05d}.{self.format}{self.suffixes[self.compression]}"
+        self._writer = NTriplesWriter(
+            path, format=self.format, compression=self.compression, **self.kwargs
+        )
+        self.paths.append(path)
+        return self._writer
+
+    def add(self, triple: tuple):
+        self._shard().add(triple)
+
+    def write(self, triples: Iterable[tuple]) -> int:
+        before = self.count
+        for triple in triples:
+            self.add(triple)
+        return self.count - before
+
+    def write_raw(self, data: bytes, count: Union[int, None] = None):
+        self._shard().write_raw(data, count)
+
+    def close(self):
+        if self.closed:
+            return
+        if self._writer is not None:
+            self._count += self._writer.count
+            self._writer.close()
+            self._writer = None
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
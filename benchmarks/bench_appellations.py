@@ -0,0 +1,33 @@
+"""Times `make_appellations` over a synthetic tei:listPlace.
+
+python -m benchmarks.bench_appellations [number of places] [repeats]
+"""
+
+import sys
+import time
+
+from acdh_cidoc_pyutils import make_appellations
+from benchmarks.run import CountingSink, entities
+
+
+def run(size=100_000, repeats=3) -> float:
+    places = entities("listPlace", size)
+    best = None
+    for _ in range(repeats):
+        sink = CountingSink()
+        start = time.perf_counter()
+        for subj, node in places:
+            make_appellations(
+                subj, node, type_domain="https://foo/bar/types", sink=sink
+            )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(
+        f"make_appellations: {size} places, {sink.count} triples, best of {repeats}: {best:.2f}s"
+    )
+    return best
+
+
+if __name__ == "__main__":
+    args = [int(x) for x in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,241 @@
+"""Times and memory-profiles the builders over synthetic registers and compares against a baseline.
+
+    python -m benchmarks.run --size 10000 --output results.json
+    python -m benchmarks.run --size 10000 --baseline benchmarks/baseline.json --threshold 0.2
+
+The exit code is 1 if any case got slower (or used more memory) than the baseline by more than
+`threshold`; store a baseline by writing `--output` to the baseline path.
+"""  # noqa: E501
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import lxml.etree as ET
+from rdflib import URIRef
+
+from acdh_cidoc_pyutils import (
+    coordinates_to_p168,
+    list_place_coordinates_to_p168,
+    create_e52,
+    make_affiliations,
+    make_appellations,
+    make_birth_death_entities,
+    make_e42_identifiers,
+    make_occupations,
+    p89_falls_within,
+    p95i_was_formed_by,
+    tei_relation_to_SRPC3_in_social_relation,
+    teidoc_as_f24_publication_expression,
+)
+from acdh_cidoc_pyutils.cache import library_version
+from acdh_cidoc_pyutils.namespaces import NSMAP
+from benchmarks.synthetic import make_document, make_register
+
+DOMAIN = "https://foo/bar/"
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
+
+class CountingSink:
+    """a sink that only counts triples, so the benchmarks measure the builders alone"""
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, triple):
+        self.count += 1
+
+
+def entities(kind: str, size: int) -> list:
+    root = ET.fromstring(make_register(kind, size).encode("utf-8"))
+    tag = kind[4:].lower()
+    return [
+        (URIRef(f"{DOMAIN}{x.get(XML_ID)}"), x)
+        for x in root.iterfind(f".//{{{NSMAP['tei']}}}{tag}")
+    ]
+
+
+def build_cases(size: int, tmp_dir: str) -> dict:
+    """returns {name: (function running the case with a sink, number of entities)}"""
+    persons = entities("listPerson", size)
+    places = entities("listPlace", size)
+    orgs = entities("listOrg", size)
+    relations = ET.fromstring(make_register("listRelation", size).encode("utf-8"))
+    relations = list(relations.iterfind(f".//{{{NSMAP['tei']}}}relation"))
+    doc_path = os.path.join(tmp_dir, "letter.xml")
+    with open(doc_path, "w", encoding="utf-8") as f:
+        f.write(make_document(20 * size))
+
+    def each(items, builder, **kwargs):
+        def run(sink):
+            for subj, node in items:
+                builder(subj, node, sink=sink, **kwargs)
+
+        return run
+
+    def list_place_case(sink):
+        list_place_coordinates_to_p168(places, sink=sink)
+
+    def relation_case(sink):
+        for node in relations:
+            tei_relation_to_SRPC3_in_social_relation(node, domain=DOMAIN, sink=sink)
+
+    def e52_case(sink):
+        for i in range(size):
+            create_e52(
+                URIRef(f"{DOMAIN}ts/{i}"),
+                begin_of_begin=f"{1700 + i % 300}",
+                end_of_end=f"{1700 + i % 300}-12-31",
+                sink=sink,
+            )
+
+    def p95i_case(sink):
+        for i, (subj, _) in enumerate(orgs):
+            p95i_was_formed_by(
+                subj, start_date=f"{1800 + i % 200}", end_date="1990", sink=sink
+            )
+
+    def f24_case(sink):
+        teidoc_as_f24_publication_expression(
+            doc_path,
+            DOMAIN,
+            title_xpath=".//tei:titleStmt/tei:title[@level='a']",
+            sink=sink,
+        )
+
+    return {
+        "make_appellations": (
+            each(persons + places + orgs, make_appellations),
+            3 * size,
+        ),
+        "make_e42_identifiers": (
+            each(persons + places + orgs, make_e42_identifiers),
+            3 * size,
+        ),
+        "coordinates_to_p168": (each(places, coordinates_to_p168), size),
+        "list_place_coordinates_to_p168": (list_place_case, size),
+        "p89_falls_within": (each(places, p89_falls_within, domain=DOMAIN), size),
+        "make_birth_death_entities": (
+            each(persons, make_birth_death_entities, domain=DOMAIN),
+            size,
+        ),
+        "make_occupations": (each(persons, make_occupations), size),
+        "make_affiliations": (
+            each(persons, make_affiliations, domain=DOMAIN, person_label="Person"),
+            size,
+        ),
+        "tei_relation_to_SRPC3_in_social_relation": (relation_case, size),
+        "create_e52": (e52_case, size),
+        "p95i_was_formed_by": (p95i_case, size),
+        # one letter with 20 * size paragraphs
+        "teidoc_as_f24_publication_expression": (f24_case, 20 * size),
+    }
+
+
+def measure(case, repeats=3, memory=True) -> dict:
+    best = None
+    for _ in range(repeats):
+        sink = CountingSink()
+        start = time.perf_counter()
+        case(sink)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    result = {"seconds": round(best, 4), "triples": sink.count}
+    if memory:
+        tracemalloc.start()
+        case(CountingSink())
+        result["peak_kib"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+
+def run(size=1000, repeats=3, memory=True, only=None) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = build_cases(size, tmp_dir)
+        results = {}
+        for name, (case, count) in cases.items():
+            if only and name not in only:
+                continue
+            results[name] = {"entities": count, **measure(case, repeats, memory)}
+            print(
+                f"{name:45} {results[name]['seconds']:>9.3f}s "
+                f"{results[name].get('peak_kib', '-'):>9} KiB",
+                file=sys.stderr,
+            )
+    return {
+        "meta": {
+            "size": size,
+            "repeats": repeats,
+            "library_version": library_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict, baseline: dict, threshold=0.2, min_seconds=0.01
+) -> list[str]:
+    """returns a message for every case that is slower/bigger than the baseline by more than threshold
+
+    Timings of cases that took less than `min_seconds` in the baseline are too noisy and skipped.
+    """  # noqa: E501
+    if current["meta"]["size"] != baseline["meta"]["size"]:
+        raise ValueError(
+            f"baseline was measured with size {baseline['meta']['size']}, "
+            f"not {current['meta']['size']}"
+        )
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ["seconds", "peak_kib"]:
+            if metric not in result or not base.get(metric):
+                continue
+            if metric == "seconds" and base[metric] < min_seconds:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{name}: {metric} {base[metric]} -> {result[metric]} (+{ratio - 1:.0%})"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="entities per register")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--only", nargs="*", help="names of the cases to run")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    args = parser.parse_args(argv)
+    current = run(args.size, args.repeats, not args.no_memory, args.only)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.min_seconds)
+        for x in regressions:
+            print(f"REGRESSION {x}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
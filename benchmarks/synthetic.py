@@ -0,0 +1,129 @@
+"""Synthetic TEI registers and documents shaped like the fixtures in tests/test_cidoc_pyutils.py."""
+
+import random
+
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+NAME_TYPES = [None, "pref", "alt", "orig_name", "full"]
+LANGS = [None, "de", "en", "it", "und"]
+OCCUPATIONS = ["Zeichner und Maler", "Schriftsteller", "Journalist", "Ärztin"]
+RELATIONS = ["ist-verheiratet-mit", "ist-verlobt-mit", "in-intimer-beziehung-zu"]
+
+
+def _attrs(**kwargs) -> str:
+    return "".join(
+        f' {k.replace("_", ":", 1) if k == "xml_lang" else k}="{v}"'
+        for k, v in kwargs.items()
+        if v
+    )
+
+
+def _date(rnd: random.Random) -> str:
+    year = rnd.randint(1700, 1990)
+    shape = rnd.random()
+    if shape < 0.6:
+        return f"{year}"
+    if shape < 0.8:
+        return f"{year}-{rnd.randint(1, 12):02d}"
+    return f"{year}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+
+
+def _idnos(rnd: random.Random, i: int) -> str:
+    idnos = [f'<idno type="pmb">https://pmb.acdh.oeaw.ac.at/entity/{i}/</idno>']
+    if rnd.random() < 0.5:
+        idnos.append(f'<idno type="gnd">http://d-nb.info/gnd/{10000000 + i}X</idno>')
+    if rnd.random() < 0.3:
+        idnos.append(f'<idno subtype="foobarid">{i}</idno>')
+    return "".join(idnos)
+
+
+def _names(rnd: random.Random, tag: str, i: int) -> str:
+    names = []
+    for j in range(rnd.randint(1, 3)):
+        attrs = _attrs(type=rnd.choice(NAME_TYPES), xml_lang=rnd.choice(LANGS))
+        if tag == "persName" and rnd.random() < 0.5:
+            text = f"<forename>Vorname{j}</forename><surname>Nachname{i}</surname>"
+        elif rnd.random() < 0.05:
+            text = f"<settlement>Name {i}</settlement>"
+        else:
+            text = f"Name  {i}\n   Variante {j}"
+        names.append(f"<{tag}{attrs}>{text}</{tag}>")
+    return "".join(names)
+
+
+def make_person(rnd: random.Random, i: int, places: int) -> str:
+    parts = [_names(rnd, "persName", i)]
+    for event in ["birth", "death"]:
+        if rnd.random() < 0.8:
+            place = f"DWplace{rnd.randrange(places):06d}"
+            parts.append(
+                f'<{event} when="{_date(rnd)}">{event}'
+                f'<placeName key="#{place}">Ort</placeName></{event}>'
+            )
+    for j in range(rnd.randint(0, 2)):
+        dates = _attrs(notBefore=_date(rnd), notAfter=_date(rnd) if j else None)
+        parts.append(f"<occupation{dates}>{rnd.choice(OCCUPATIONS)}</occupation>")
+    for j in range(rnd.randint(0, 2)):
+        org = f"DWorg{rnd.randrange(max(places // 10, 1)):06d}"
+        dates = _attrs(notBefore=_date(rnd), notAfter=_date(rnd))
+        parts.append(f'<affiliation ref="#{org}"{dates}>Org {org}</affiliation>')
+    parts.append(_idnos(rnd, i))
+    return f'<person xml:id="DWpers{i:06d}">{"".join(parts)}</person>'
+
+
+def make_place(rnd: random.Random, i: int, places: int) -> str:
+    parts = [_names(rnd, "placeName", i), _idnos(rnd, i)]
+    lat, lng = rnd.uniform(-90, 90), rnd.uniform(-180, 180)
+    parts.append(f"<location><geo>{lat:.6f} {lng:.6f}</geo></location>")
+    if i and rnd.random() < 0.5:
+        parts.append(
+            '<location type="located_in_place">'
+            f'<placeName key="DWplace{rnd.randrange(i):06d}">Region</placeName></location>'
+        )
+    return f'<place xml:id="DWplace{i:06d}">{"".join(parts)}</place>'
+
+
+def make_org(rnd: random.Random, i: int, places: int) -> str:
+    parts = [_names(rnd, "orgName", i), _idnos(rnd, i)]
+    return f'<org xml:id="DWorg{i:06d}">{"".join(parts)}</org>'
+
+
+def make_relation(rnd: random.Random, i: int, persons: int) -> str:
+    active, passive = rnd.randrange(persons), rnd.randrange(persons)
+    return (
+        f'<relation name="{rnd.choice(RELATIONS)}" active="#DWpers{active:06d}" '
+        f'passive="#DWpers{passive:06d}" n="Person {active} - Person {passive}"/>'
+    )
+
+
+REGISTERS = {
+    "listPerson": make_person,
+    "listPlace": make_place,
+    "listOrg": make_org,
+    "listRelation": make_relation,
+}
+
+
+def make_register(kind: str, size: int, seed=42) -> str:
+    """returns a TEI document with a `kind` (listPerson|listPlace|listOrg|listRelation) of `size` entries"""  # noqa: E501
+    rnd = random.Random(seed)
+    entries = "".join(REGISTERS[kind](rnd, i, size) for i in range(size))
+    return f'<TEI xmlns="{TEI_NS}"><text><body><{kind}>{entries}</{kind}></body></text></TEI>'
+
+
+def make_document(paragraphs: int, seed=42) -> str:
+    """returns a TEI letter with a teiHeader and `paragraphs` paragraphs, every third mentions an entity"""  # noqa: E501
+    rnd = random.Random(seed)
+    body = []
+    for i in range(paragraphs):
+        if i % 3 == 0:
+            kind = rnd.choice(["person", "place", "org"])
+            mention = f'<rs type="{kind}" ref="#{kind}{rnd.randrange(1000)}">Name</rs>'
+        else:
+            mention = "<hi>lorem</hi>"
+        body.append(f"<p>Absatz {i} {mention} ipsum dolor sit amet</p>")
+    return (
+        f'<TEI xmlns="{TEI_NS}"><teiHeader><fileDesc><titleStmt>'
+        '<title level="a">Synthetischer Brief, 6. 8. 1889</title>'
+        "</titleStmt></fileDesc></teiHeader>"
+        f'<text><body>{"".join(body)}</body></text></TEI>'
+    )
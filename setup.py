@@ -25,8 +25,12 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Natural Language :: English",
     ],
+    entry_points={
+        "console_scripts": ["cidoc-convert=acdh_cidoc_pyutils.cli:main"],
+    },
     description="Helper functions for the generation of CIDOC CRMish RDF (from XML/TEI data)",
     install_requires=requirements,
+    extras_require={"zstd": ["zstandard"], "numpy": ["numpy"]},
     license="MIT license",
     long_description=readme,
     long_description_content_type="text/markdown",
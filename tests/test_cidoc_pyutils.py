@@ -1,13 +1,23 @@
 import unittest
+import contextlib
 import os
+import gzip
+import io
+import shutil
+import tempfile
 import lxml.etree as ET
 
 from lxml.etree import Element
-from rdflib import Graph, URIRef, RDF
+from rdflib import Dataset, Graph, URIRef, RDF, RDFS, OWL
 from acdh_tei_pyutils.tei import TeiReader
 from acdh_tei_pyutils.utils import get_xmlid
 
-from acdh_cidoc_pyutils.utils import remove_trailing_slash
+from acdh_cidoc_pyutils.utils import (
+    remove_trailing_slash,
+    cached_xpath,
+    compile_authority_patterns,
+    element_text,
+)
 
 from acdh_cidoc_pyutils import (
     date_to_literal,
@@ -25,8 +35,54 @@ from acdh_cidoc_pyutils import (
     tei_relation_to_SRPC3_in_social_relation,
     p95i_was_formed_by,
     teidoc_as_f24_publication_expression,
+    iter_appellations,
+    iter_e42_identifiers,
+    iter_e52,
+    iter_occupations,
+    xpath_cache_info,
+    dates_to_literals,
+    date_cache_info,
+    TimeSpanRegistry,
+    normalize_uris,
+    uri_cache_info,
+    mint_uri,
+    mint_uris,
+    tei_list_relation_to_SRPC3_in_social_relation,
+    list_place_coordinates_to_p168,
+    OrgRegistry,
+    TypeRegistry,
+)
+from acdh_cidoc_pyutils.namespaces import (
+    NSMAP,
+    CIDOC,
+    CIDOC_TERMS,
+    FRBROO_TERMS,
+    SARI_FRBROO_TERMS,
+)
+from acdh_cidoc_pyutils.writers import NTriplesWriter, ShardedWriter
+from acdh_cidoc_pyutils.cli import convert_standard, main as cli_main
+from benchmarks.run import CountingSink, build_cases, compare
+from benchmarks.synthetic import make_register
+from acdh_cidoc_pyutils.parallel import ENTITY_XPATH, convert_entities, corpus_as_f24
+from acdh_cidoc_pyutils.readers import iter_register_entities
+from acdh_cidoc_pyutils.cache import BuildCache
+from acdh_cidoc_pyutils.instrumentation import Collector, active_collector
+from acdh_cidoc_pyutils.pipeline import (
+    PipelineMetrics,
+    convert_files,
+    f24_converter,
+    register_converter,
 )
-from acdh_cidoc_pyutils.namespaces import NSMAP, CIDOC
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 sample = """
 <TEI xmlns="http://www.tei-c.org/ns/1.0">
@@ -705,3 +761,1006 @@ mein schatz ich liebe    dich
         g.serialize("normalized.ttl")
         result = g.serialize(format="ttl")
         self.assertTrue("https://d-nb.info/gnd/101791799X" in result)
+
+    def test_018_sink(self):
+        doc = ET.fromstring(sample)
+        g = Graph()
+        for x in doc.xpath(".//tei:place|.//tei:org", namespaces=NSMAP):
+            xml_id = x.attrib["{http://www.w3.org/XML/1998/namespace}id"].lower()
+            subj = URIRef(f"https://foo/bar/{xml_id}")
+            result = make_appellations(subj, x, sink=g)
+            self.assertIs(result, g)
+            make_e42_identifiers(subj, x, sink=g)
+        compare = Graph()
+        for x in doc.xpath(".//tei:place|.//tei:org", namespaces=NSMAP):
+            xml_id = x.attrib["{http://www.w3.org/XML/1998/namespace}id"].lower()
+            subj = URIRef(f"https://foo/bar/{xml_id}")
+            compare += make_appellations(subj, x)
+            compare += make_e42_identifiers(subj, x)
+        self.assertEqual(set(g), set(compare))
+
+        triples = []
+
+        class ListSink:
+            def add(self, triple):
+                triples.append(triple)
+
+        person = doc.xpath(".//tei:person[1]", namespaces=NSMAP)[0]
+        subj = URIRef("https://foo/bar/dwpers0091")
+        sink, uris = make_occupations(subj, person, sink=ListSink())
+        self.assertIsInstance(sink, ListSink)
+        self.assertEqual(len(uris), 2)
+        make_birth_death_entities(subj, person, "https://foo/bar/", sink=sink)
+        p95i_was_formed_by(subj, start_date="1900", sink=sink)
+        self.assertTrue(any(x[1] == CIDOC["P98_brought_into_life"] for x in triples))
+        self.assertTrue(any(x[1] == CIDOC["P95i_was_formed_by"] for x in triples))
+
+    def test_019_iter_triples(self):
+        doc = ET.fromstring(sample)
+        for x in doc.xpath(".//tei:place|.//tei:org", namespaces=NSMAP):
+            xml_id = x.attrib["{http://www.w3.org/XML/1998/namespace}id"].lower()
+            subj = URIRef(f"https://foo/bar/{xml_id}")
+            triples = iter_appellations(subj, x)
+            self.assertFalse(isinstance(triples, (list, Graph)))
+            self.assertEqual(set(triples), set(make_appellations(subj, x)))
+            self.assertEqual(
+                set(iter_e42_identifiers(subj, x)), set(make_e42_identifiers(subj, x))
+            )
+        uri = URIRef("https://foo/bar/time-span")
+        triples = list(iter_e52(uri, begin_of_begin="1900", end_of_end="1901-01"))
+        self.assertEqual(len(triples), 4)
+        self.assertEqual(
+            set(triples),
+            set(create_e52(uri, begin_of_begin="1900", end_of_end="1901-01")),
+        )
+        person = doc.xpath(".//tei:person[1]", namespaces=NSMAP)[0]
+        subj = URIRef("https://foo/bar/dwpers0091")
+        triples = iter_occupations(subj, person)
+        collected = []
+        try:
+            while True:
+                collected.append(next(triples))
+        except StopIteration as e:
+            occ_uris = e.value
+        self.assertEqual(len(occ_uris), 2)
+        self.assertTrue(all(len(x) == 3 for x in collected))
+
+    def test_020_ntriples_writer(self):
+        doc = ET.fromstring(sample)
+        compare = Graph()
+        stream = io.BytesIO()
+        with NTriplesWriter(stream, compression="gzip", buffer_size=512) as writer:
+            for x in doc.xpath(".//tei:place|.//tei:org", namespaces=NSMAP):
+                xml_id = x.attrib["{http://www.w3.org/XML/1998/namespace}id"]
+                subj = URIRef(f"https://foo/bar/{xml_id}")
+                make_appellations(subj, x, sink=writer)
+                compare += make_appellations(subj, x)
+            writer.write(create_e52(URIRef("https://foo/bar/ts"), end_of_end="1900"))
+            compare += create_e52(URIRef("https://foo/bar/ts"), end_of_end="1900")
+        data = gzip.decompress(stream.getvalue())
+        self.assertEqual(writer.count, len(data.splitlines()))
+        g = Graph().parse(data=data, format="nt")
+        self.assertEqual(set(g), set(compare))
+
+        stream = io.BytesIO()
+        graph_name = URIRef("https://foo/bar/graph")
+        with NTriplesWriter(stream, format="nq", graph_name=graph_name) as writer:
+            writer.write(compare)
+        lines = stream.getvalue().decode("utf-8").splitlines()
+        self.assertTrue(all(x.endswith("<https://foo/bar/graph> .") for x in lines))
+        with self.assertRaises(ValueError):
+            NTriplesWriter(io.BytesIO(), format="ttl")
+        with NTriplesWriter(io.BytesIO()) as raw_writer:
+            raw_writer.write_raw(stream.getvalue())
+            raw_writer.write_raw(b"", 0)
+        self.assertEqual(raw_writer.count, len(lines))
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_021_ntriples_writer_zstd(self):
+        stream = io.BytesIO()
+        compare = create_e52(URIRef("https://foo/bar/ts"), begin_of_begin="1900")
+        with NTriplesWriter(stream, compression="zstd") as writer:
+            writer.write(compare)
+        data = (
+            zstandard.ZstdDecompressor().decompressobj().decompress(stream.getvalue())
+        )
+        g = Graph().parse(data=data, format="nt")
+        self.assertEqual(set(g), set(compare))
+
+    def test_022_convert_entities(self):
+        doc = ET.fromstring(sample)
+        domain = "https://foo/bar/"
+        compare = Graph()
+        for x in doc.xpath(".//tei:place|.//tei:org|.//tei:person", namespaces=NSMAP):
+            xml_id = x.attrib["{http://www.w3.org/XML/1998/namespace}id"]
+            subj = URIRef(f"{domain}{xml_id}")
+            make_appellations(subj, x, sink=compare)
+            make_e42_identifiers(subj, x, sink=compare)
+        handlers = [make_appellations, make_e42_identifiers]
+        for workers in [1, 2]:
+            chunks = list(
+                convert_entities(
+                    doc,
+                    handlers,
+                    domain,
+                    workers=workers,
+                    chunk_size=3,
+                    entity_xpath=".//tei:place|.//tei:org|.//tei:person",
+                )
+            )
+            self.assertEqual(len(chunks), 3)
+            g = Graph().parse(data=b"".join(chunks), format="nt")
+            self.assertEqual(set(g), set(compare))
+
+    def test_023_xpath_cache(self):
+        doc = ET.fromstring(sample)
+        expression = ".//tei:place/tei:idno[@type='pmb']/text()"
+        self.assertEqual(
+            cached_xpath(doc, expression), doc.xpath(expression, namespaces=NSMAP)
+        )
+        before = xpath_cache_info()
+        cached_xpath(doc, expression)
+        after = xpath_cache_info()
+        self.assertEqual(after.hits, before.hits + 1)
+        self.assertEqual(after.misses, before.misses)
+        node = doc.xpath(".//tei:place[1]", namespaces=NSMAP)[0]
+        make_appellations(URIRef("https://foo/bar/place"), node)
+        before = xpath_cache_info()
+        make_appellations(URIRef("https://foo/bar/place"), node)
+        after = xpath_cache_info()
+        self.assertGreater(after.hits, before.hits)
+        self.assertEqual(after.misses, before.misses)
+
+    def test_024_vocabulary_terms(self):
+        self.assertEqual(
+            CIDOC_TERMS["P1_is_identified_by"], CIDOC["P1_is_identified_by"]
+        )
+        self.assertIs(CIDOC_TERMS["E55_Type"], CIDOC_TERMS["E55_Type"])
+        self.assertTrue("F51_Pursuit" in FRBROO_TERMS)
+        with self.assertRaises(KeyError):
+            CIDOC_TERMS["P1_is_identifed_by"]
+        g = make_appellations(
+            URIRef("https://foo/bar/place"),
+            ET.fromstring(sample).xpath(".//tei:place[1]", namespaces=NSMAP)[0],
+        )
+        for _, p, o in g:
+            if p == RDF.type:
+                self.assertTrue(o in CIDOC_TERMS.values())
+
+    def test_025_dates_batch_and_cache(self):
+        literals = dates_to_literals(DATE_STRINGS)
+        for i, x in enumerate(literals):
+            self.assertEqual(f"{x.datatype}", DATE_TYPES[i])
+        literals = dates_to_literals(["19xx", "1900-1", "1914", "1914", None])
+        self.assertEqual(
+            [f"{x.datatype}" for x in literals[:3]],
+            [
+                "http://www.w3.org/2001/XMLSchema#string",
+                "http://www.w3.org/2001/XMLSchema#string",
+                "http://www.w3.org/2001/XMLSchema#gYear",
+            ],
+        )
+        self.assertIs(literals[2], literals[3])
+        self.assertEqual(literals[4].language, "en")
+        before = date_cache_info()
+        self.assertIs(date_to_literal("1918-11-11"), date_to_literal("1918-11-11"))
+        self.assertGreater(date_cache_info().hits, before.hits)
+
+    def test_026_time_span_registry(self):
+        domain = "https://foo/bar/"
+        sample = """
+<person xmlns="http://www.tei-c.org/ns/1.0" xml:id="DWpers0091">
+    <persName type="pref">Gulbransson, Olaf</persName>
+    <affiliation notBefore="1900" notAfter="1931" ref="DWorg00010">SPD</affiliation>
+    <affiliation notBefore="1931" ref="#DWorg00009">SAPD</affiliation>
+    <affiliation notBefore="1938" notAfter="1945-01-02" ref="#DWorg00010">SPD</affiliation>
+</person>"""
+        node = ET.fromstring(sample)
+        subj = URIRef(f"{domain}DWpers0091")
+        e52 = CIDOC_TERMS["E52_Time-Span"]
+        g = make_affiliations(subj, node, domain, person_label="Olaf")
+        self.assertEqual(len(list(g.subjects(RDF.type, e52))), 5)
+        registry = TimeSpanRegistry(domain=domain)
+        g = make_affiliations(
+            subj, node, domain, person_label="Olaf", time_spans=registry
+        )
+        p95i_was_formed_by(
+            URIRef(f"{domain}DWorg00010"),
+            start_date="1900",
+            time_spans=registry,
+            sink=g,
+        )
+        self.assertEqual(len(list(g.subjects(RDF.type, e52))), 4)
+        self.assertEqual(len(registry), 4)
+        self.assertEqual(registry.hits, 2)
+        ts_uri = URIRef("https://foo/bar/time-span/1931_1931")
+        self.assertEqual(
+            len(list(g.subjects(CIDOC_TERMS["P4_has_time-span"], ts_uri))), 2
+        )
+        self.assertEqual(len(list(g.predicate_objects(ts_uri))), 4)
+        type_uri = URIRef("https://foo/bar/types/date/birth")
+        uri, is_new = registry.resolve("1931", "1931", type_uri)
+        self.assertTrue(is_new)
+        self.assertNotEqual(uri, ts_uri)
+        self.assertEqual(
+            uri, TimeSpanRegistry(domain).make_uri("1931", "1931", type_uri)
+        )
+
+    def test_027_uri_normalization_cache(self):
+        uris = [
+            "http://d-nb.info/gnd/101791799X",
+            "https://www.geonames.org/2761369/wien.html",
+            "http://d-nb.info/gnd/101791799X",
+        ]
+        before = uri_cache_info()
+        normalized = normalize_uris(uris)
+        self.assertEqual(
+            normalized,
+            [
+                "https://d-nb.info/gnd/101791799X",
+                "https://sws.geonames.org/2761369/",
+                "https://d-nb.info/gnd/101791799X",
+            ],
+        )
+        self.assertGreater(uri_cache_info().hits, before.hits)
+        matcher = compile_authority_patterns(("d-nb.info", "geonames"))
+        self.assertIs(matcher, compile_authority_patterns(("d-nb.info", "geonames")))
+        self.assertTrue(matcher.search(normalized[1]))
+        self.assertFalse(matcher.search("https://example.org/d-nb-info"))
+        sample = """
+<person xmlns="http://www.tei-c.org/ns/1.0" xml:id="DWpers0091">
+    <idno type="GND">http://d-nb.info/gnd/101791799X</idno>
+    <idno type="URL">https://example.org/DWpers0091</idno>
+</person>"""
+        subj = URIRef("https://foo/bar/DWpers0091")
+        g = make_e42_identifiers(subj, ET.fromstring(sample))
+        self.assertEqual(
+            list(g.objects(subj, OWL.sameAs)),
+            [URIRef("https://d-nb.info/gnd/101791799X")],
+        )
+        g = make_e42_identifiers(subj, ET.fromstring(sample), authority_patterns=[])
+        self.assertEqual(len(list(g.objects(subj, OWL.sameAs))), 2)
+
+    def test_028_f24_streaming(self):
+        file_path = os.path.join("tests", "L02643.xml")
+        domain = "https://schnitzler-briefe.acdh.oeaw.ac.at"
+        title_xpath = ".//tei:titleStmt/tei:title[@level='a']"
+        subj, g, mentions = teidoc_as_f24_publication_expression(
+            file_path, domain, title_xpath
+        )
+        s_subj, s_g, s_mentions = teidoc_as_f24_publication_expression(
+            file_path, domain, title_xpath, streaming=True
+        )
+        self.assertEqual(subj, s_subj)
+        self.assertEqual(mentions, s_mentions)
+        self.assertEqual(set(g), set(s_g))
+        sample = """<TEI xmlns="http://www.tei-c.org/ns/1.0">
+    <teiHeader><fileDesc><titleStmt><title>Ein <hi>Brief</hi></title></titleStmt></fileDesc></teiHeader>
+    <text><body>
+        <p><rs type="person" ref="#p1">A <rs type="place" ref="#pl1 #pl2">Wien</rs></rs></p>
+        <p><rs type="org" ref="#o1"><orgName>SPD</orgName></rs><rs type="work" ref="#w1">X</rs></p>
+    </body></text>
+</TEI>"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "sample.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(sample)
+            expected = [
+                [["p1", "person"], ["pl1", "place"], ["pl2", "place"], ["o1", "org"]],
+                [["o1", "org"]],
+            ]
+            for i, xpath in enumerate(
+                [
+                    ".//tei:rs[@ref and (@type='person' or @type='place' or @type='org')]",
+                    ".//tei:rs[@ref and ./tei:orgName]",
+                ]
+            ):
+                _, g, mentions = teidoc_as_f24_publication_expression(
+                    file_path, domain, mentions_xpath=xpath
+                )
+                _, s_g, s_mentions = teidoc_as_f24_publication_expression(
+                    file_path, domain, mentions_xpath=xpath, streaming=True
+                )
+                self.assertEqual(mentions, expected[i])
+                self.assertEqual(s_mentions, expected[i])
+                self.assertEqual(set(g), set(s_g))
+            with self.assertRaises(ValueError):
+                teidoc_as_f24_publication_expression(
+                    file_path, domain, mentions_xpath="//tei:rs", streaming=True
+                )
+            title = (
+                '<title level="a">Brief an <rs type="person" ref="#p1">'
+                "Arthur Schnitzler</rs>, 6. 8. 1889</title>"
+            )
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(sample.replace("<title>Ein <hi>Brief</hi></title>", title))
+            for streaming in [False, True]:
+                subj, g, mentions = teidoc_as_f24_publication_expression(
+                    file_path, domain, title_xpath, streaming=streaming
+                )
+                self.assertEqual(
+                    str(g.value(subj, RDFS.label)),
+                    "Brief an Arthur Schnitzler, 6. 8. 1889",
+                )
+                self.assertEqual(mentions[0], ["p1", "person"])
+
+    def test_029_corpus_as_f24(self):
+        domain = "https://schnitzler-briefe.acdh.oeaw.ac.at"
+        with open(os.path.join("tests", "L02643.xml"), "rb") as f:
+            data = f.read()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i in range(3):
+                with open(os.path.join(tmp_dir, f"L0000{i}.xml"), "wb") as f:
+                    f.write(data)
+            with open(os.path.join(tmp_dir, "broken.xml"), "wb") as f:
+                f.write(b"<TEI>")
+            for workers in [1, 2]:
+                output = io.BytesIO()
+                mentions, failures = corpus_as_f24(
+                    tmp_dir,
+                    domain,
+                    output,
+                    workers=workers,
+                    title_xpath=".//tei:titleStmt/tei:title[@level='a']",
+                )
+                self.assertEqual(len(mentions), 3)
+                self.assertEqual(len(mentions[os.path.join(tmp_dir, "L00001.xml")]), 17)
+                self.assertEqual(list(failures), [os.path.join(tmp_dir, "broken.xml")])
+                g = Graph().parse(data=output.getvalue().decode("utf-8"), format="nt")
+                f24 = SARI_FRBROO_TERMS["F24_Publication_Expression"]
+                self.assertEqual(len(list(g.subjects(RDF.type, f24))), 3)
+            missing = os.path.join(tmp_dir, "missing.xml")
+            paths = [os.path.join(tmp_dir, "L00000.xml"), missing]
+            mentions, failures = corpus_as_f24(paths, domain, io.BytesIO(), workers=1)
+            self.assertEqual(list(mentions), paths[:1])
+            self.assertTrue(failures[missing].startswith("FileNotFoundError"))
+
+    def test_030_build_cache(self):
+        domain = "https://schnitzler-briefe.acdh.oeaw.ac.at"
+        title_xpath = ".//tei:titleStmt/tei:title[@level='a']"
+        with open(os.path.join("tests", "L02643.xml"), "rb") as f:
+            data = f.read()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "L02643.xml")
+            with open(file_path, "wb") as f:
+                f.write(data)
+            cache = BuildCache(os.path.join(tmp_dir, "cache"), version="1.0")
+            subj, g, mentions = cache.f24(file_path, domain, title_xpath=title_xpath)
+            c_subj, c_g, c_mentions = cache.f24(
+                file_path, domain, title_xpath=title_xpath
+            )
+            self.assertEqual((cache.misses, cache.hits), (1, 1))
+            self.assertEqual((subj, mentions), (c_subj, c_mentions))
+            self.assertEqual(set(g), set(c_g))
+            cache.f24(file_path, domain)
+            with open(file_path, "ab") as f:
+                f.write(b"\n")
+            cache.f24(file_path, domain, title_xpath=title_xpath)
+            self.assertEqual((cache.misses, cache.hits), (3, 1))
+            copy_path = os.path.join(tmp_dir, "L02644.xml")
+            shutil.copyfile(file_path, copy_path)
+            copy_subj, _, _ = cache.f24(copy_path, domain, title_xpath=title_xpath)
+            self.assertEqual(copy_subj, URIRef(f"{domain}/L02644.xml"))
+            self.assertEqual((cache.misses, cache.hits), (4, 1))
+            with self.assertRaises(ValueError):
+                cache.f24(file_path, domain, type_registry=TypeRegistry())
+
+            register_path = os.path.join(tmp_dir, "register.xml")
+            with open(register_path, "w", encoding="utf-8") as f:
+                f.write(sample)
+            handlers = [make_appellations]
+            nt = cache.entities(register_path, handlers, "https://foo/bar/", workers=1)
+            self.assertEqual(
+                cache.entities(register_path, handlers, "https://foo/bar/", workers=1),
+                nt,
+            )
+            self.assertEqual(cache.hits, 2)
+
+            new_cache = BuildCache(os.path.join(tmp_dir, "cache"), version="1.1")
+            new_cache.f24(file_path, domain, title_xpath=title_xpath)
+            self.assertEqual((new_cache.misses, new_cache.hits), (1, 0))
+            self.assertEqual(new_cache.prune(), 1)
+            self.assertEqual(os.listdir(os.path.join(tmp_dir, "cache")), ["1.1"])
+
+    def test_031_mint_uri(self):
+        domain = "https://hansi4ever.com/"
+        uri = mint_uri("DWpers0091", domain=domain, version="1", prefix="sumsi")
+        self.assertEqual(uri, mint_uri("DWpers0091", domain, "1", "sumsi"))
+        self.assertTrue(uri.startswith("https://hansi4ever.com/1/sumsi/"))
+        self.assertNotEqual(uri, mint_uri("DWpers0092", domain, "1", "sumsi"))
+        self.assertNotEqual(uri, mint_uri("DWpers0091", domain, "2", "sumsi"))
+        short_uri = mint_uri("DWpers0091", domain, method="base32", length=10)
+        self.assertEqual(len(short_uri.split("/")[-1]), 10)
+        keys = [f"DWpers{i:04d}" for i in range(1000)] + ["DWpers0091"]
+        uris = mint_uris(keys, domain, "1", "sumsi")
+        self.assertEqual(uris[91], uri)
+        self.assertEqual(uris[-1], uri)
+        self.assertEqual(len(set(uris)), 1000)
+        with self.assertRaises(ValueError):
+            mint_uris(keys, domain, method="base32", length=1)
+        with self.assertRaises(ValueError):
+            mint_uri("DWpers0091", method="uuid1")
+
+    def test_032_instrumentation(self):
+        doc = ET.fromstring(sample)
+        domain = "https://foo/bar/"
+        relation = ET.fromstring(
+            """<relation xmlns="http://www.tei-c.org/ns/1.0" name="ist-verlobt-mit"
+            active="#21208" passive="#24420" n="Verlobung"/>"""
+        )
+        with Collector() as stats:
+            self.assertIs(active_collector(), stats)
+            for x in doc.xpath(".//tei:place", namespaces=NSMAP):
+                subj = URIRef(
+                    f"{domain}{x.get('{http://www.w3.org/XML/1998/namespace}id')}"
+                )
+                make_appellations(subj, x)
+                coordinates_to_p168(subj, x)
+            g = tei_relation_to_SRPC3_in_social_relation(
+                relation, lookup_dict={"ist-verheiratet-mit": "married"}
+            )
+        self.assertIsNone(active_collector())
+        result = stats.to_dict()
+        appellations = result["builders"]["make_appellations"]
+        self.assertEqual(appellations["calls"], 3)
+        self.assertGreater(appellations["xpath"], 3)
+        self.assertGreater(appellations["seconds"], 0)
+        self.assertEqual(
+            result["builders"]["tei_relation_to_SRPC3_in_social_relation"]["triples"],
+            len(g),
+        )
+        self.assertEqual(
+            result["events"],
+            {
+                "coordinates_to_p168": {
+                    "coordinates_not_found": 1,
+                    "coordinates_not_parsable": 1,
+                },
+                "tei_relation_to_SRPC3_in_social_relation": {
+                    "relation_type_not_found": 1
+                },
+            },
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            prom_path = os.path.join(tmp_dir, "cidoc.prom")
+            stats.to_prometheus(prom_path)
+            with open(prom_path, "r", encoding="utf-8") as f:
+                prom = f.read()
+            self.assertIn(
+                'acdh_cidoc_pyutils_builder_calls_total{builder="make_appellations"} 3',
+                prom,
+            )
+            json_path = os.path.join(tmp_dir, "cidoc.json")
+            stats.to_json(json_path)
+            self.assertTrue(os.path.isfile(json_path))
+
+    def test_033_element_text(self):
+        node = ET.fromstring(
+            """<occupation>Mitarbeiter  des <!-- comment --><title
+                level="j">Simplicissimus</title>\n und <hi>Zeichn</hi>er</occupation>"""
+        )
+        self.assertEqual(
+            element_text(node), normalize_string(" ".join(node.xpath(".//text()")))
+        )
+        self.assertEqual(
+            element_text(node), "Mitarbeiter des Simplicissimus und Zeichn er"
+        )
+        self.assertEqual(
+            element_text(node, separator=""),
+            "Mitarbeiter des Simplicissimus und Zeichner",
+        )
+
+    def test_034_list_relation(self):
+        domain = "https://pmb.acdh.oeaw.ac.at/entity/"
+        lookup_dict = {
+            "in-intimer-beziehung-zu": "Intimate-relation",
+            "ist-verlobt-mit": "https://hansi/sumsi/#Is-engaged-to",
+            "ist-verheiratet-mit": "https://hansi/sumsi/Is-married-to",
+        }
+        names = list(lookup_dict)
+        names += [
+            "ist-asdfverheiratet-mit",
+            "ist-asdfverheiratet-mit",
+            "ist-verlobt-mit",
+        ]
+        relations = "".join(
+            f'<relation name="{name}" active="#p{i}" passive="#p{i + 1}" n="Relation {i}"/>'
+            for i, name in enumerate(names)
+        )
+        sample = f"""<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body>
+            <listRelation>{relations}</listRelation></body></text></TEI>"""
+        doc = ET.fromstring(sample)
+        for kwargs in [{"lookup_dict": lookup_dict}, {}]:
+            compare = Graph()
+            for x in doc.xpath(".//tei:relation", namespaces=NSMAP):
+                tei_relation_to_SRPC3_in_social_relation(
+                    x, domain=domain, entity_prefix="person_", sink=compare, **kwargs
+                )
+            g, unmapped = tei_list_relation_to_SRPC3_in_social_relation(
+                doc, domain=domain, entity_prefix="person_", **kwargs
+            )
+            self.assertEqual(set(g), set(compare))
+        self.assertEqual(unmapped, {})
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "relations.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(sample)
+            writer_output = io.BytesIO()
+            with NTriplesWriter(writer_output) as writer:
+                _, unmapped = tei_list_relation_to_SRPC3_in_social_relation(
+                    file_path,
+                    domain=domain,
+                    lookup_dict=lookup_dict,
+                    entity_prefix="person_",
+                    sink=writer,
+                )
+            self.assertEqual(writer.count, 6 * 5)
+        self.assertEqual(unmapped, {"ist-asdfverheiratet-mit": 2})
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_035_list_place_coordinates(self):
+        geos = {
+            "vienna": "48.2082 16.3738",
+            "graz": "47.0707, 15.4395",
+            "linz": "14.2858 48.3069",
+            "swapped": "148.2 16.37",
+            "out": "123 456",
+            "text": "north east",
+            "broken": "48.2",
+            "missing": None,
+        }
+        places = []
+        for key, geo in geos.items():
+            location = f"<location><geo>{geo}</geo></location>" if geo else ""
+            place = ET.fromstring(
+                f'<place xmlns="http://www.tei-c.org/ns/1.0">{location}</place>'
+            )
+            places.append((URIRef(f"https://foo/bar/{key}"), place))
+        g, report = list_place_coordinates_to_p168(places, precision=4)
+        data = g.serialize(format="nt")
+        self.assertTrue('"Point(16.3738 48.2082)"' in data)
+        self.assertTrue('"Point(15.4395 47.0707)"' in data)
+        self.assertTrue('"Point(48.3069 14.2858)"' in data)
+        self.assertEqual(len(g), 3)
+        self.assertEqual(report["places"], 8)
+        self.assertEqual(report["converted"], 3)
+        self.assertEqual(report["not_found"], ["https://foo/bar/missing"])
+        self.assertEqual(
+            report["not_parsable"], ["https://foo/bar/broken", "https://foo/bar/text"]
+        )
+        self.assertEqual(report["out_of_range"], ["https://foo/bar/out"])
+        self.assertEqual(report["swapped"], ["https://foo/bar/swapped"])
+
+        g, report = list_place_coordinates_to_p168(
+            places, precision=2, swap_radius=10, fix_swapped=True
+        )
+        data = g.serialize(format="nt")
+        self.assertEqual(
+            report["swapped"], ["https://foo/bar/linz", "https://foo/bar/swapped"]
+        )
+        self.assertTrue('"Point(14.29 48.31)"' in data)
+        self.assertTrue('"Point(148.20 16.37)"' in data)
+        self.assertEqual(report["converted"], 4)
+        with Collector() as stats:
+            list_place_coordinates_to_p168(places)
+        self.assertEqual(
+            stats.to_dict()["events"]["list_place_coordinates_to_p168"],
+            {
+                "coordinates_not_found": 1,
+                "coordinates_not_parsable": 2,
+                "coordinates_out_of_range": 1,
+                "coordinates_swapped": 1,
+            },
+        )
+
+    def test_036_org_registry(self):
+        domain = "https://foo/bar/"
+        list_org = """
+<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body><listOrg>
+    <org xml:id="DWorg00010">
+        <orgName>Sozialdemokratische Partei</orgName>
+        <orgName type="pref">SPD</orgName>
+    </org>
+    <org xml:id="DWorg00009"><orgName>Sozialistische
+        Arbeiterpartei</orgName></org>
+    <org><orgName>no id</orgName></org>
+</listOrg></body></text></TEI>"""
+        persons = """
+<listPerson xmlns="http://www.tei-c.org/ns/1.0">
+    <person xml:id="DWpers0091">
+        <affiliation notBefore="1900" ref="#DWorg00010">Sozi</affiliation>
+        <affiliation notBefore="1931" ref="#DWorg00009">SAPD</affiliation>
+    </person>
+    <person xml:id="DWpers0092">
+        <affiliation notBefore="1910" ref="#DWorg00010">SPÖ</affiliation>
+        <affiliation notBefore="1920" ref="#DWorg00011">KPD</affiliation>
+        <affiliation notBefore="1921" ref="#DWorg00011">K.P.D.</affiliation>
+    </person>
+</listPerson>"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "listorg.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(list_org)
+            registry = OrgRegistry(domain).load(file_path)
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(
+            len(OrgRegistry(domain).load(ET.fromstring(list_org))), len(registry)
+        )
+        g = Graph()
+        for x in ET.fromstring(persons).xpath(".//tei:person", namespaces=NSMAP):
+            subj = URIRef(f"{domain}{get_xmlid(x)}")
+            make_affiliations(
+                subj,
+                x,
+                domain,
+                person_label=get_xmlid(x),
+                add_org_object=True,
+                org_registry=registry,
+                sink=g,
+            )
+        labels = {
+            f"{s}": f"{g.value(s, RDFS.label)}"
+            for s in g.subjects(RDF.type, CIDOC_TERMS["E74_Group"])
+        }
+        self.assertEqual(
+            labels,
+            {
+                f"{domain}DWorg00010": "SPD",
+                f"{domain}DWorg00009": "Sozialistische Arbeiterpartei",
+                f"{domain}DWorg00011": "KPD",
+            },
+        )
+        self.assertEqual(
+            len(list(g.triples((URIRef(f"{domain}DWorg00010"), None, None)))), 2
+        )
+        join_labels = {
+            f"{o}"
+            for s in g.subjects(RDF.type, CIDOC_TERMS["E85_Joining"])
+            for o in g.objects(s, RDFS.label)
+        }
+        self.assertEqual(
+            join_labels,
+            {
+                "DWpers0091 joins SPD",
+                "DWpers0091 joins Sozialistische Arbeiterpartei",
+                "DWpers0092 joins SPD",
+                "DWpers0092 joins KPD",
+            },
+        )
+        registry = OrgRegistry(domain).load(ET.fromstring(list_org))
+        person = ET.fromstring(persons).xpath(".//tei:person", namespaces=NSMAP)[0]
+        subj = URIRef(f"{domain}DWpers0091")
+        groups = []
+        for add_org_object in [False, True, True]:
+            g = make_affiliations(
+                subj,
+                person,
+                domain,
+                person_label="DWpers0091",
+                add_org_object=add_org_object,
+                org_registry=registry,
+            )
+            groups.append(len(list(g.subjects(RDF.type, CIDOC_TERMS["E74_Group"]))))
+        self.assertEqual(groups, [0, 2, 0])
+
+    def test_037_birth_death_subtree(self):
+        domain = "https://foo/bar/"
+        node = ET.fromstring(
+            """<person xmlns="http://www.tei-c.org/ns/1.0" xml:id="DWpers0091">
+    <persName><forename>Olaf</forename><surname>Gulbransson</surname></persName>
+    <birth><date when="1873-05-26"/><settlement><placeName key="#wrong"/></settlement>
+        <placeName key="#DWplace00139">Christiania</placeName></birth>
+    <death when="1958"><placeName>Tegernsee</placeName></death>
+</person>"""
+        )
+        subj = URIRef(f"{domain}DWpers0091")
+        p7 = CIDOC_TERMS["P7_took_place_at"]
+        g, birth_uri, _ = make_birth_death_entities(subj, node, domain)
+        self.assertEqual(g.value(birth_uri, p7), URIRef(f"{domain}wrong"))
+        g, birth_uri, time_span_uri = make_birth_death_entities(
+            subj,
+            node,
+            domain,
+            date_node_xpath="tei:date",
+            place_id_xpath="/tei:placeName/@key",
+        )
+        self.assertEqual(g.value(birth_uri, p7), URIRef(f"{domain}DWplace00139"))
+        self.assertEqual(
+            f"{g.value(time_span_uri, CIDOC_TERMS['P82a_begin_of_the_begin'])}",
+            "1873-05-26",
+        )
+        g, death_uri, _ = make_birth_death_entities(
+            subj, node, domain, event_type="death"
+        )
+        self.assertIsNone(g.value(death_uri, p7))
+        for collector in [None, Collector(), None]:
+            with self.assertWarns(UserWarning) as warning:
+                if collector is None:
+                    make_birth_death_entities(
+                        subj,
+                        node,
+                        domain,
+                        place_id_xpath="/ancestor::tei:TEI//tei:placeName/@key",
+                    )
+                else:
+                    with collector:
+                        make_birth_death_entities(
+                            subj, node, domain, date_node_xpath="../tei:date"
+                        )
+            # raised on every call and attributed to the caller
+            self.assertEqual(warning.filename, __file__)
+
+    def test_038_type_registry(self):
+        domain = "https://foo/bar/"
+        doc = ET.fromstring(sample)
+        items = [
+            (URIRef(f"{domain}{get_xmlid(x)}"), x)
+            for x in doc.xpath(
+                ".//tei:person|.//tei:place|.//tei:org", namespaces=NSMAP
+            )
+        ]
+        graphs, counts = [], []
+        for registry in [None, TypeRegistry()]:
+            g = Graph()
+            with NTriplesWriter(io.BytesIO()) as writer:
+                for sink in [g, writer]:
+                    if registry is not None:
+                        registry = TypeRegistry()
+                    for subj, x in items:
+                        make_appellations(
+                            subj,
+                            x,
+                            type_domain=domain,
+                            type_registry=registry,
+                            sink=sink,
+                        )
+                        make_e42_identifiers(
+                            subj,
+                            x,
+                            type_domain=domain,
+                            type_registry=registry,
+                            sink=sink,
+                        )
+            graphs.append(g)
+            counts.append(writer.count)
+        self.assertEqual(set(graphs[0]), set(graphs[1]))
+        self.assertLess(counts[1], counts[0])
+        e55 = CIDOC_TERMS["E55_Type"]
+        self.assertEqual(counts[1] - len(graphs[1]), 0)
+        self.assertEqual(len(registry), len(list(graphs[1].subjects(RDF.type, e55))))
+        self.assertEqual(
+            registry.make_uri(f"{domain}person/persName", "Orig Name"),
+            URIRef(f"{domain}person/persname/orig-name"),
+        )
+
+        registry = TypeRegistry()
+        file_path = os.path.join("tests", "L02643.xml")
+        with NTriplesWriter(io.BytesIO()) as writer:
+            teidoc_as_f24_publication_expression(
+                file_path, domain, type_registry=registry, sink=writer
+            )
+            first = writer.count
+            teidoc_as_f24_publication_expression(
+                file_path, domain, type_registry=registry, sink=writer
+            )
+        self.assertEqual(writer.count - first, first - 6)
+        self.assertEqual(len(registry), 3)
+
+    def test_039_pipeline(self):
+        domain = "https://schnitzler-briefe.acdh.oeaw.ac.at"
+        title_xpath = ".//tei:titleStmt/tei:title[@level='a']"
+        with open(os.path.join("tests", "L02643.xml"), "rb") as f:
+            data = f.read()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i in range(4):
+                with open(os.path.join(tmp_dir, f"L0000{i}.xml"), "wb") as f:
+                    f.write(data)
+            with open(os.path.join(tmp_dir, "broken.xml"), "wb") as f:
+                f.write(b"<TEI>")
+            expected = io.BytesIO()
+            corpus_as_f24(tmp_dir, domain, expected, workers=1, title_xpath=title_xpath)
+            expected = set(Graph().parse(data=expected.getvalue(), format="nt"))
+            for executor in ["thread", "process"]:
+                output = io.BytesIO()
+                metrics = PipelineMetrics()
+                mentions, failures, metrics = convert_files(
+                    tmp_dir,
+                    f24_converter(domain, title_xpath=title_xpath),
+                    output,
+                    executor=executor,
+                    workers=2,
+                    queue_size=1,
+                    metrics=metrics,
+                )
+                g = Graph().parse(data=output.getvalue(), format="nt")
+                self.assertEqual(set(g), expected)
+                self.assertEqual(len(mentions), 4)
+                self.assertEqual(len(mentions[os.path.join(tmp_dir, "L00001.xml")]), 17)
+                self.assertEqual(list(failures), [os.path.join(tmp_dir, "broken.xml")])
+                stats = metrics.to_dict()
+                self.assertEqual(stats["files_read"], 5)
+                self.assertEqual(stats["files_converted"], 4)
+                self.assertEqual(stats["files_failed"], 1)
+                self.assertEqual(stats["triples"], output.getvalue().count(b"\n"))
+                self.assertEqual(stats["queues"]["read"]["size"], 1)
+                self.assertLessEqual(stats["queues"]["read"]["max_depth"], 1)
+
+            register_path = os.path.join(tmp_dir, "register.xml")
+            with open(register_path, "w", encoding="utf-8") as f:
+                f.write(sample)
+            output = io.BytesIO()
+            results, failures, metrics = convert_files(
+                [register_path],
+                register_converter([make_appellations], "https://foo/bar/"),
+                output,
+                executor="thread",
+            )
+            entities = ET.fromstring(sample).xpath(
+                ".//tei:person|.//tei:place|.//tei:org|.//tei:bibl", namespaces=NSMAP
+            )
+            compare = Graph()
+            for x in entities:
+                subj = URIRef(f"https://foo/bar/{get_xmlid(x)}")
+                make_appellations(subj, x, sink=compare)
+            g = Graph().parse(data=output.getvalue(), format="nt")
+            self.assertEqual(set(g), set(compare))
+            self.assertEqual(results, {register_path: len(entities)})
+            self.assertEqual(failures, {})
+
+    def test_040_register_reader(self):
+        register = sample.replace(
+            "</person>",
+            '<note><bibl xml:id="nested_bibl"><title>Buch</title></bibl></note></person>',
+            1,
+        )
+        doc = ET.fromstring(register)
+        expected = [get_xmlid(x) for x in cached_xpath(doc, ENTITY_XPATH)]
+        self.assertTrue("nested_bibl" in expected)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "register.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(register)
+            ids, previous = [], None
+            for x in iter_register_entities(file_path):
+                if previous is not None and previous.getparent() is x.getparent():
+                    # the previous top-level entity is cleared and removed
+                    self.assertEqual(len(previous), 0)
+                ids.append(get_xmlid(x))
+                previous = x
+            self.assertEqual(ids, expected)
+            outermost = [
+                get_xmlid(x)
+                for x in iter_register_entities(
+                    file_path, tags=["person", "bibl"], nested=False, huge_tree=True
+                )
+            ]
+            self.assertEqual(
+                outermost,
+                [
+                    get_xmlid(x)
+                    for x in cached_xpath(
+                        doc,
+                        "(.//tei:person|.//tei:bibl)[not(ancestor::tei:person|ancestor::tei:bibl)]",
+                    )
+                ],
+            )
+            handlers = [make_appellations, make_e42_identifiers]
+            entity_xpath = ".//tei:place|.//tei:org|.//tei:person"
+            from_file = convert_entities(
+                file_path,
+                handlers,
+                "https://foo/bar/",
+                workers=1,
+                entity_xpath=entity_xpath,
+            )
+            from_doc = convert_entities(
+                doc, handlers, "https://foo/bar/", workers=1, entity_xpath=entity_xpath
+            )
+            self.assertEqual(b"".join(from_file), b"".join(from_doc))
+
+    def test_041_cli(self):
+        domain = "https://foo/bar/"
+        doc = ET.fromstring(sample)
+        expected = Graph()
+        for x in cached_xpath(doc, ENTITY_XPATH):
+            convert_standard(
+                URIRef(f"{domain}{get_xmlid(x)}"),
+                x,
+                domain,
+                f"{domain}types/",
+                sink=expected,
+            )
+        self.assertTrue(len(expected) > 0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "register.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(sample)
+            prefix = os.path.join(tmp_dir, "out", "entities")
+            shard_size = len(expected) // 3
+            args = [file_path, "--domain", domain, "-o", prefix, "--workers", "1"]
+            args += ["--shard-size", f"{shard_size}", "--chunk-size", "2", "-q"]
+            self.assertEqual(cli_main(args), 0)
+            shards = sorted(os.listdir(os.path.join(tmp_dir, "out")))
+            self.assertTrue(len(shards) >= 3)
+            self.assertEqual(shards[0], "entities-00000.nt.gz")
+            g = Graph()
+            for x in shards:
+                with gzip.open(os.path.join(tmp_dir, "out", x), "rb") as f:
+                    data = f.read()
+                self.assertTrue(data.count(b"\n") <= shard_size + 500)
+                g.parse(data=data, format="nt")
+            self.assertEqual(set(g), set(expected))
+            args = [file_path, "-d", domain, "-o", prefix, "-w", "1", "-q"]
+            args += ["-f", "nq", "-c", "none", "--graph-name", f"{domain}graph"]
+            self.assertEqual(cli_main(args), 0)
+            g = Dataset()
+            g.parse(f"{prefix}.nq", format="nquads")
+            self.assertEqual(set(g.graph(URIRef(f"{domain}graph"))), set(expected))
+        nested = sample.replace(
+            "</person>", "<note><bibl><title>Buch</title></bibl></note></person>", 1
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "register.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(nested)
+            prefix = os.path.join(tmp_dir, "nested")
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                self.assertEqual(cli_main([file_path, "-d", domain, "-o", prefix]), 0)
+            self.assertTrue("1 skipped (no @xml:id)" in stderr.getvalue())
+            with gzip.open(f"{prefix}.nt.gz", "rb") as f:
+                g = Graph().parse(data=f.read(), format="nt")
+            self.assertEqual(set(g), set(expected))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with ShardedWriter(os.path.join(tmp_dir, "x"), shard_size=2) as writer:
+                for triple in list(expected)[:5]:
+                    writer.add(triple)
+            self.assertEqual(writer.count, 5)
+            self.assertEqual(
+                [os.path.basename(x) for x in writer.paths][-1], "x-00002.nt.gz"
+            )
+            lines = [f"{x}\n".encode("utf-8") for x in range(5)]
+            raw_prefix = os.path.join(tmp_dir, "raw")
+            with ShardedWriter(raw_prefix, shard_size=2) as raw_writer:
+                for line in lines:
+                    raw_writer.write_raw(line)
+            self.assertEqual(raw_writer.count, 5)
+            self.assertEqual(len(raw_writer.paths), 3)
+
+    def test_042_benchmark_compare(self):
+        def results(size, **cases):
+            return {"meta": {"size": size}, "results": cases}
+
+        baseline = results(
+            100,
+            fast={"seconds": 0.005, "peak_kib": 100},
+            slow={"seconds": 1.0, "peak_kib": 100},
+            removed={"seconds": 1.0},
+        )
+        current = results(
+            100,
+            fast={"seconds": 0.05, "peak_kib": 100},
+            slow={"seconds": 1.1, "peak_kib": 200},
+            added={"seconds": 9.0},
+        )
+        # "fast" is below min_seconds, 1.1s is within the threshold, the memory is not
+        self.assertEqual(
+            compare(current, baseline, threshold=0.2),
+            ["slow: peak_kib 100 -> 200 (+100%)"],
+        )
+        self.assertEqual(len(compare(current, baseline, threshold=0.05)), 2)
+        self.assertEqual(len(compare(current, baseline, min_seconds=0.001)), 2)
+        with self.assertRaises(ValueError):
+            compare(results(1000), baseline)
+
+        register = make_register("listPerson", 3)
+        self.assertEqual(register, make_register("listPerson", 3))
+        self.assertEqual(
+            len(ET.fromstring(register).xpath(".//tei:person", namespaces=NSMAP)), 3
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            case, count = build_cases(3, tmp_dir)["make_appellations"]
+        sink = CountingSink()
+        case(sink)
+        self.assertEqual(count, 9)
+        self.assertTrue(sink.count > 0)